@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     "rest_framework",
+    "adrf",
     "rest_framework_simplejwt",
     "corsheaders",
     "core",
@@ -99,6 +100,33 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# 'persistent' holds effectively static lookups (geocoding, country codes) on disk,
+# shared by all worker processes and kept across restarts
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'persistent': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('PERSISTENT_CACHE_DIR', BASE_DIR / '.cache' / 'persistent'),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+# With DEFAULT_CACHE_DIR set, the default cache (API tool results, LLM recommendations)
+# is kept on disk there instead of in process memory, e.g. so repeated test runs
+# are served from disk rather than refetched
+if os.getenv('DEFAULT_CACHE_DIR'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('DEFAULT_CACHE_DIR'),
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -118,6 +146,15 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Argon2id first; PBKDF2 hashes from older accounts are upgraded on next login
+PASSWORD_HASHERS = [
+    'UserApp.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -143,3 +180,8 @@ AZURE_TENANT_ID = os.getenv('AZURE_TENANT_ID')
 AZURE_CLIENT_SECRET = os.getenv('AZURE_CLIENT_SECRET')
 PROJECT_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
 AZURE_OPENAI_MODEL = os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME')
+# Max agent runs in flight per process; tune to the deployment's rate limit
+AZURE_LLM_CONCURRENCY = int(os.getenv('AZURE_LLM_CONCURRENCY', '8'))
+# Bulk recommendation jobs go through the Batch API, which needs a Global Batch deployment
+AZURE_OPENAI_BATCH_DEPLOYMENT_NAME = os.getenv('AZURE_OPENAI_BATCH_DEPLOYMENT_NAME', AZURE_OPENAI_MODEL)
+AZURE_OPENAI_API_VERSION = os.getenv('AZURE_OPENAI_API_VERSION', '2024-10-21')
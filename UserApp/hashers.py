@@ -0,0 +1,33 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.db import close_old_connections
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id tuned for web logins - keeps a hash well under ~100ms
+    Hashes stay in the standard "argon2" format, so existing ones still verify
+    and are upgraded to these parameters on the next successful login
+    """
+    time_cost = 2
+    memory_cost = 65536
+    parallelism = 2
+
+
+# Password hashing is the longest CPU step of a login. Async views hand it
+# to this pool (argon2 releases the GIL) so the event loop keeps serving
+HASHING_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+
+def authenticate_in_pool(**credentials):
+    """authenticate() for HASHING_POOL threads, which live outside any request"""
+    close_old_connections()
+    try:
+        return authenticate(**credentials)
+    finally:
+        close_old_connections()
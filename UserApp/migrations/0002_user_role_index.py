@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-15 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UserApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('hr_manager', 'HR Manager'), ('traveler', 'Traveler')], db_index=True, default='traveler', max_length=20),
+        ),
+    ]
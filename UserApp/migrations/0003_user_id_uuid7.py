@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-15 21:58
+
+import UserApp.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UserApp', '0002_user_role_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(default=UserApp.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
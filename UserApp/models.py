@@ -1,13 +1,14 @@
 # user/models.py
 
 from django.contrib.auth.models import AbstractUser, Group, Permission
-from django.db import models
-import uuid
+from django.db import models, transaction
+from django.utils.functional import cached_property
+from .utils import uuid7
 
 class User(AbstractUser):
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False
     )
 
@@ -19,7 +20,8 @@ class User(AbstractUser):
     role = models.CharField(
         max_length=20,
         choices=Role.choices,
-        default=Role.TRAVELER
+        default=Role.TRAVELER,
+        db_index=True
     )
 
     # Basic personal info
@@ -52,5 +54,28 @@ class User(AbstractUser):
         verbose_name="user permissions"
     )
 
+    # Bit per role so permission checks are a single integer test
+    ROLE_BITS = {
+        Role.ADMIN: 1,
+        Role.HR_MANAGER: 2,
+        Role.TRAVELER: 4,
+    }
+
+    @cached_property
+    def role_bit(self):
+        return self.ROLE_BITS.get(self.role, 0)
+
+    def save(self, *args, **kwargs):
+        # Travelers get their profile when the user is first inserted, whichever
+        # path creates them (registration, create_user, createsuperuser, admin)
+        if not self._state.adding or self.role != self.Role.TRAVELER:
+            return super().save(*args, **kwargs)
+
+        from core.models import Traveler
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Traveler.objects.create(user=self)
+
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -1,21 +1,32 @@
 from rest_framework.permissions import BasePermission
+from .models import User
 
 
-class IsAdmin(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == "admin"
+ADMIN = User.ROLE_BITS[User.Role.ADMIN]
+HR_MANAGER = User.ROLE_BITS[User.Role.HR_MANAGER]
+TRAVELER = User.ROLE_BITS[User.Role.TRAVELER]
 
 
-class IsHRManager(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == "hr_manager"
+def require_roles(*roles):
+    """Build a single permission class allowing authenticated users with any of ``roles``"""
+    role_mask = 0
+    for role in frozenset(roles):
+        role_mask |= User.ROLE_BITS[role]
 
+    class RolePermission(BasePermission):
+        mask = role_mask
 
-class IsTraveler(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == "traveler"
+        def has_permission(self, request, view):
+            user = request.user
+            return bool(user.is_authenticated and user.role_bit & self.mask)
 
+    RolePermission.__name__ = RolePermission.__qualname__ = "Require" + "Or".join(
+        role.title().replace("_", "") for role in roles
+    )
+    return RolePermission
 
-class IsAdminOrHR(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in ["admin", "hr_manager"]
+
+IsAdmin = require_roles(User.Role.ADMIN)
+IsHRManager = require_roles(User.Role.HR_MANAGER)
+IsTraveler = require_roles(User.Role.TRAVELER)
+IsAdminOrHR = require_roles(User.Role.ADMIN, User.Role.HR_MANAGER)
@@ -1,9 +1,33 @@
+import asyncio
+from functools import partial
 from rest_framework import serializers
+from rest_framework.serializers import as_serializer_error
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate
+from django.core.cache import cache
 from rest_framework_simplejwt.tokens import RefreshToken
+from .hashers import HASHING_POOL, authenticate_in_pool
 from .models import User
 
 
+# Signed token pairs are reused for a few seconds so bursts of logins for the
+# same user don't re-sign identical claims; well below the access token lifetime
+TOKEN_CACHE_TIMEOUT = 10
+
+
+def get_tokens_for_user(user):
+    """Return an (access, refresh) token pair, briefly cached per user"""
+    cache_key = f"jwt:{user.id}"
+    tokens = cache.get(cache_key)
+
+    if tokens is None:
+        refresh = RefreshToken.for_user(user)
+        tokens = (str(refresh.access_token), str(refresh))
+        cache.set(cache_key, tokens, TOKEN_CACHE_TIMEOUT)
+
+    return tokens
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
 
@@ -28,7 +52,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password')
         user = User(**validated_data)
         user.set_password(password)
+        # Also creates a traveler's profile, in the same transaction
         user.save()
+
         return user
 
 
@@ -41,17 +67,49 @@ class LoginSerializer(serializers.Serializer):
             username=data.get('username'),
             password=data.get('password')
         )
+        return self._login_payload(user)
+
+    async def avalidate(self, data):
+        user = await asyncio.get_running_loop().run_in_executor(
+            HASHING_POOL,
+            partial(
+                authenticate_in_pool,
+                username=data.get('username'),
+                password=data.get('password')
+            )
+        )
+        return await sync_to_async(self._login_payload)(user)
+
+    async def ais_valid(self, raise_exception=False):
+        """
+        Async counterpart of is_valid() - the password hash is checked on
+        HASHING_POOL so it doesn't block the event loop
+        """
+        try:
+            data = self.to_internal_value(self.initial_data)
+            self._validated_data = await self.avalidate(data)
+        except serializers.ValidationError as exc:
+            self._validated_data = {}
+            self._errors = as_serializer_error(exc)
+        else:
+            self._errors = {}
 
+        if self._errors and raise_exception:
+            raise serializers.ValidationError(self.errors)
+
+        return not bool(self._errors)
+
+    def _login_payload(self, user):
         if not user:
             raise serializers.ValidationError("Invalid credentials")
 
-        refresh = RefreshToken.for_user(user)
+        access, refresh = get_tokens_for_user(user)
 
         return {
             'user_id': user.id,
             'username': user.username,
             'role': user.role,
             'email': user.email,
-            'access': str(refresh.access_token),
-            'refresh': str(refresh),
+            'access': access,
+            'refresh': refresh,
         }
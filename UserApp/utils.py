@@ -0,0 +1,23 @@
+import os
+import time
+import uuid
+
+try:
+    from uuid_utils.compat import uuid7 as _native_uuid7
+except ImportError:
+    _native_uuid7 = None
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7)
+    The leading 48 bits are the Unix time in milliseconds, so new primary keys
+    land at the end of the index instead of on a random page
+    Uses the Rust-backed uuid_utils generator when it is installed
+    """
+    if _native_uuid7 is not None:
+        return _native_uuid7()
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
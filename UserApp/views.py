@@ -1,6 +1,7 @@
 from django.shortcuts import render,HttpResponse
 
 from rest_framework.views import APIView
+from adrf.views import APIView as AsyncAPIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 
@@ -28,11 +29,11 @@ class RegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LoginView(APIView):
+class LoginView(AsyncAPIView):
     permission_classes = [permissions.AllowAny]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        await serializer.ais_valid(raise_exception=True)
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
@@ -0,0 +1,61 @@
+"""
+Shared setup for the test scripts
+Loaded once by pytest, and imported by the scripts when run directly, so Django
+is configured and the shared traveler looked up once per process
+"""
+
+import functools
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TravelRiskAnalyser.settings')
+# Tool and LLM results are cached on disk, so reruns within their TTLs skip the network
+os.environ.setdefault('DEFAULT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'tests'))
+django.setup()
+
+try:
+    import pytest
+except ImportError:
+    # Scripts run directly don't need pytest
+    pytest = None
+
+
+@functools.cache
+def shared_traveler():
+    """Traveler profile used by all agent tests, looked up (or created) once per run"""
+    from django.contrib.auth.hashers import make_password
+
+    from core.models import Traveler
+    from UserApp.models import User
+
+    # A dedicated user, so the profile doesn't depend on whoever registered first;
+    # the password default is a callable, hashed only when the user is created
+    user, created = User.objects.get_or_create(
+        username='test_traveler_shared',
+        defaults={
+            'email': 'test@example.com',
+            'password': lambda: make_password('testpass123'),
+            'role': User.Role.TRAVELER
+        }
+    )
+
+    if created:
+        # Saving the new user gave it an empty profile; fill in the test's conditions
+        Traveler.objects.filter(user=user).update(health_conditions='Asthma', frequent_traveler=False)
+
+    # With the user joined, so traveler.user never costs a query later
+    traveler, _ = Traveler.objects.select_related('user').get_or_create(
+        user=user,
+        defaults={
+            'health_conditions': 'Asthma',
+            'frequent_traveler': False
+        }
+    )
+    return traveler
+
+
+if pytest is not None:
+    @pytest.fixture(scope='session')
+    def traveler():
+        return shared_traveler()
@@ -2,6 +2,26 @@ from django.contrib import admin
 from .models import Traveler, Trip, RiskAnalysisReport
 # Register your models here.
 
+
+class TripAdmin(admin.ModelAdmin):
+    # Trip.__str__ reads traveler.user - join it instead of a query per row
+    list_select_related = ("traveler__user",)
+
+
+class RiskAnalysisReportAdmin(admin.ModelAdmin):
+    # __str__ walks trip -> traveler -> user; all single-valued, so JOIN them
+    # up front to avoid three extra queries per changelist row
+    list_select_related = ("trip__traveler__user",)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The changelist never shows the JSON blobs, so don't load them
+        match = request.resolver_match
+        if match and match.url_name.endswith("_changelist"):
+            return queryset.summaries()
+        return queryset
+
+
 admin.site.register(Traveler)
-admin.site.register(Trip)
-admin.site.register(RiskAnalysisReport)
\ No newline at end of file
+admin.site.register(Trip, TripAdmin)
+admin.site.register(RiskAnalysisReport, RiskAnalysisReportAdmin)
@@ -0,0 +1,35 @@
+# GIN index for containment lookups on RiskAnalysisReport.top_risks
+# (e.g. top_risks__contains=["Vaccination Required: Yellow Fever"]).
+# jsonb_path_ops is PostgreSQL-only, so other backends skip it.
+
+from django.db import migrations
+
+
+INDEX_NAME = "rar_top_risks_gin"
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("core", "RiskAnalysisReport")._meta.db_table
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {schema_editor.quote_name(table)} "
+        "USING gin (top_risks jsonb_path_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_riskanalysisreport'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
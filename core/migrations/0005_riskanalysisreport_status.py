@@ -0,0 +1,25 @@
+# Generated by Django 6.0
+
+from django.db import migrations, models
+
+
+def mark_existing_completed(apps, schema_editor):
+    # Reports saved before analyses ran in the background are all finished ones
+    RiskAnalysisReport = apps.get_model("core", "RiskAnalysisReport")
+    RiskAnalysisReport.objects.update(status="completed")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_riskanalysisreport_top_risks_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='riskanalysisreport',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_completed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0
+
+from django.db import migrations, models
+
+
+def mark_unfinished_unknown(apps, schema_editor):
+    # Pending and failed reports were saved as "Low" from their placeholder score
+    RiskAnalysisReport = apps.get_model("core", "RiskAnalysisReport")
+    RiskAnalysisReport.objects.exclude(status="completed").update(risk_level="Unknown")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_riskanalysisreport_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='riskanalysisreport',
+            name='risk_level',
+            field=models.CharField(choices=[('Low', 'Low Risk'), ('Medium', 'Medium Risk'), ('High', 'High Risk'), ('Unknown', 'Unknown')], max_length=20),
+        ),
+        migrations.RunPython(mark_unfinished_unknown, migrations.RunPython.noop),
+    ]
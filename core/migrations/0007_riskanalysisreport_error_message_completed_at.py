@@ -0,0 +1,35 @@
+# Generated by Django 6.0
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def split_run_state(apps, schema_editor):
+    # Completed reports hold a result; failed ones kept their error in full_report
+    RiskAnalysisReport = apps.get_model("core", "RiskAnalysisReport")
+    RiskAnalysisReport.objects.filter(status="completed").update(completed_at=F("updated_at"))
+    for report in RiskAnalysisReport.objects.filter(status="failed"):
+        report.error_message = (report.full_report or {}).get("message", "")
+        report.full_report = {}
+        report.save(update_fields=["error_message", "full_report"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_riskanalysisreport_unknown_risk_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='riskanalysisreport',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='riskanalysisreport',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(split_run_state, migrations.RunPython.noop),
+    ]
@@ -52,6 +52,15 @@ class Trip(models.Model):
         return f"{self.traveler} → {self.destination_country}"
 
 
+class RiskAnalysisReportQuerySet(models.QuerySet):
+    # Large JSON blobs only needed when a single report is shown in full
+    DETAIL_FIELDS = ("full_report", "weather_report", "disease_report")
+
+    def summaries(self):
+        """Reports for list views - scalar scores and summary data only"""
+        return self.defer(*self.DETAIL_FIELDS)
+
+
 class RiskAnalysisReport(models.Model):
     """
     Store risk analysis results from multi-agent system
@@ -60,6 +69,16 @@ class RiskAnalysisReport(models.Model):
         ("Low", "Low Risk"),
         ("Medium", "Medium Risk"),
         ("High", "High Risk"),
+        ("Unknown", "Unknown"),
+    ]
+    # Indexed by how many of the 30/60 score thresholds are reached
+    RISK_LEVELS = ("Low", "Medium", "High")
+    # Level of reports without a completed analysis, whose score means nothing yet
+    UNKNOWN_RISK_LEVEL = "Unknown"
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
     ]
     
     trip = models.OneToOneField(
@@ -68,6 +87,13 @@ class RiskAnalysisReport(models.Model):
         related_name="risk_analysis"
     )
     
+    # Analysis runs in the background; status and error_message describe the latest
+    # run, while the result fields below keep the last completed one, so a pending
+    # or failed re-run doesn't hide the previous analysis
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    error_message = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
     # Overall risk assessment
     overall_risk_score = models.IntegerField(default=0)  # 0-100
     risk_level = models.CharField(max_length=20, choices=RISK_LEVEL_CHOICES)
@@ -92,18 +118,28 @@ class RiskAnalysisReport(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = RiskAnalysisReportQuerySet.as_manager()
+    
     class Meta:
         ordering = ["-created_at"]
+        # PostgreSQL also has a GIN (jsonb_path_ops) index on top_risks,
+        # created in migration 0004 since other backends can't build it
     
     def __str__(self):
         return f"Risk Analysis for {self.trip} - {self.risk_level}"
     
     def save(self, *args, **kwargs):
-        """Ensure risk_level is set based on overall_risk_score"""
-        if self.overall_risk_score < 30:
-            self.risk_level = "Low"
-        elif self.overall_risk_score < 60:
-            self.risk_level = "Medium"
+        """Ensure risk_level is set based on overall_risk_score once an analysis has completed"""
+        if self.completed_at is not None:
+            score = self.overall_risk_score
+            self.risk_level = self.RISK_LEVELS[(score >= 30) + (score >= 60)]
         else:
-            self.risk_level = "High"
+            # No analysis has completed yet, so the score means nothing
+            self.risk_level = self.UNKNOWN_RISK_LEVEL
+
+        # Partial saves of the score must also write the derived level
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"overall_risk_score", "completed_at"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "risk_level"}
+
         super().save(*args, **kwargs)
@@ -25,6 +25,9 @@ class RiskAnalysisReportSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "trip",
+            "status",
+            "error_message",
+            "completed_at",
             "overall_risk_score",
             "risk_level",
             "weather_risk_score",
@@ -39,6 +42,9 @@ class RiskAnalysisReportSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = (
             "id",
+            "status",
+            "error_message",
+            "completed_at",
             "overall_risk_score",
             "risk_level",
             "weather_risk_score",
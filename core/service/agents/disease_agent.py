@@ -3,8 +3,10 @@ Health and Disease Risk Agent
 Analyzes disease outbreaks, COVID status, vaccination requirements, and healthcare quality
 """
 
-import json
+import asyncio
 import logging
+import re
+from functools import lru_cache
 from core.service.tools.disease_tools import (
     get_covid_status,
     get_disease_outbreaks,
@@ -12,14 +14,32 @@ from core.service.tools.disease_tools import (
     get_healthcare_quality
 )
 from core.service.llm_recommendations import (
-    generate_health_recommendations_llm,
+    generate_health_recommendations_llm_async,
     flatten_recommendations
 )
 
 logger = logging.getLogger(__name__)
 
+# One C-level scan each instead of lowering and searching per keyword
+_CONDITION_RE = re.compile(r"diabetes|asthma|immunocompromised", re.IGNORECASE)
+_MOSQUITO_DISEASE_RE = re.compile(r"malaria|dengue", re.IGNORECASE)
 
-def disease_agent(trip, traveler) -> dict:
+
+# The scans below are pure and see few distinct inputs (a traveler's conditions
+# text, a region's disease list), so their results are memoized
+@lru_cache(maxsize=256)
+def _named_conditions(health_conditions: str) -> frozenset:
+    """Lowercased tracked conditions mentioned in a traveler's health conditions"""
+    return frozenset(m.lower() for m in _CONDITION_RE.findall(health_conditions))
+
+
+@lru_cache(maxsize=256)
+def _mosquito_borne(endemic_diseases: tuple) -> frozenset:
+    """Lowercased mosquito-borne diseases named in an endemic disease list"""
+    return frozenset(m.lower() for m in _MOSQUITO_DISEASE_RE.findall("\n".join(endemic_diseases)))
+
+
+async def disease_agent(trip, traveler) -> dict:
     """
     Agent that analyzes health and disease risks for the destination
     
@@ -32,23 +52,29 @@ def disease_agent(trip, traveler) -> dict:
     """
     
     try:
-        # Get COVID-19 status
-        covid_data = get_covid_status(trip.destination_country)
+        # Fetch COVID-19 status and vaccination requirements concurrently
+        covid_data, vaccines = await asyncio.gather(
+            get_covid_status(trip.destination_country),
+            get_vaccination_requirements(trip.destination_country)
+        )
         
         # Get disease outbreak information
         outbreaks = get_disease_outbreaks(trip.destination_country)
         
-        # Get vaccination requirements
-        vaccines = get_vaccination_requirements(trip.destination_country)
-        
         # Get healthcare quality
         healthcare = get_healthcare_quality(trip.destination_country)
         
+        # Evaluate each tool's status once
+        covid_ok = covid_data.get("status") == "success"
+        outbreaks_ok = outbreaks.get("status") == "success"
+        vaccines_ok = vaccines.get("status") == "success"
+        healthcare_ok = healthcare.get("status") == "success"
+        
         # Combine risk scores
-        covid_risk = covid_data.get("risk_score", 0) if covid_data.get("status") == "success" else 5
-        outbreak_risk = outbreaks.get("risk_score", 0) if outbreaks.get("status") == "success" else 5
+        covid_risk = covid_data.get("risk_score", 0) if covid_ok else 5
+        outbreak_risk = outbreaks.get("risk_score", 0) if outbreaks_ok else 5
         vaccine_risk = 10 if vaccines.get("required_vaccines", []) else 5
-        healthcare_risk = healthcare.get("risk_score", 0) if healthcare.get("status") == "success" else 5
+        healthcare_risk = healthcare.get("risk_score", 0) if healthcare_ok else 5
         
         # Total health risk score (0-100)
         combined_risk = min((covid_risk + outbreak_risk + vaccine_risk + healthcare_risk) // 2, 100)
@@ -59,11 +85,12 @@ def disease_agent(trip, traveler) -> dict:
         # Traveler-specific considerations
         special_considerations = []
         if traveler.health_conditions:
-            if "diabetes" in traveler.health_conditions.lower():
+            conditions = _named_conditions(traveler.health_conditions)
+            if "diabetes" in conditions:
                 special_considerations.append("Ensure adequate insulin/medication supply - healthcare quality varies")
-            if "asthma" in traveler.health_conditions.lower():
+            if "asthma" in conditions:
                 special_considerations.append("Check air quality - respiratory conditions may worsen in polluted areas")
-            if "immunocompromised" in traveler.health_conditions.lower():
+            if "immunocompromised" in conditions:
                 if covid_risk > 10 or outbreak_risk > 15:
                     special_considerations.append("Higher risk from infections - consider travel insurance")
         
@@ -76,32 +103,32 @@ def disease_agent(trip, traveler) -> dict:
             "risk_score": combined_risk,
             "risk_level": risk_level,
             "covid_19": {
-                "risk_level": covid_data.get("risk_level") if covid_data.get("status") == "success" else "Unknown",
-                "cases_per_million": covid_data.get("cases_per_million") if covid_data.get("status") == "success" else None,
-                "trend": covid_data.get("trend") if covid_data.get("status") == "success" else None,
+                "risk_level": covid_data.get("risk_level") if covid_ok else "Unknown",
+                "cases_per_million": covid_data.get("cases_per_million") if covid_ok else None,
+                "trend": covid_data.get("trend") if covid_ok else None,
                 "risk_component": covid_risk
             },
             "disease_outbreaks": {
-                "endemic_diseases": outbreaks.get("endemic_diseases") if outbreaks.get("status") == "success" else [],
-                "vaccination_recommended": outbreaks.get("vaccination_recommended") if outbreaks.get("status") == "success" else False,
-                "medical_advice": outbreaks.get("consult_medical_advice") if outbreaks.get("status") == "success" else "Recommended",
+                "endemic_diseases": outbreaks.get("endemic_diseases") if outbreaks_ok else [],
+                "vaccination_recommended": outbreaks.get("vaccination_recommended") if outbreaks_ok else False,
+                "medical_advice": outbreaks.get("consult_medical_advice") if outbreaks_ok else "Recommended",
                 "risk_component": outbreak_risk
             },
             "vaccination_requirements": {
-                "required": vaccines.get("required_vaccines") if vaccines.get("status") == "success" else [],
-                "recommended": vaccines.get("recommended_vaccines") if vaccines.get("status") == "success" else [],
-                "consult_days_before": vaccines.get("consult_before_days") if vaccines.get("status") == "success" else 2,
+                "required": vaccines.get("required_vaccines") if vaccines_ok else [],
+                "recommended": vaccines.get("recommended_vaccines") if vaccines_ok else [],
+                "consult_days_before": vaccines.get("consult_before_days") if vaccines_ok else 2,
                 "risk_component": vaccine_risk
             },
             "healthcare_infrastructure": {
-                "quality_rating": healthcare.get("healthcare_quality") if healthcare.get("status") == "success" else "Unknown",
-                "accessibility": healthcare.get("accessibility") if healthcare.get("status") == "success" else "Unknown",
-                "cost_level": healthcare.get("estimated_cost_level") if healthcare.get("status") == "success" else "Unknown",
-                "recommendation": healthcare.get("recommendation") if healthcare.get("status") == "success" else "Travel insurance recommended",
+                "quality_rating": healthcare.get("healthcare_quality") if healthcare_ok else "Unknown",
+                "accessibility": healthcare.get("accessibility") if healthcare_ok else "Unknown",
+                "cost_level": healthcare.get("estimated_cost_level") if healthcare_ok else "Unknown",
+                "recommendation": healthcare.get("recommendation") if healthcare_ok else "Travel insurance recommended",
                 "risk_component": healthcare_risk
             },
             "traveler_specific_considerations": special_considerations if special_considerations else ["Standard health precautions"],
-            "recommendations": generate_health_recommendations(
+            "recommendations": await generate_health_recommendations(
                 trip, traveler, covid_data, outbreaks, vaccines, healthcare, combined_risk
             )
         }
@@ -116,26 +143,28 @@ def disease_agent(trip, traveler) -> dict:
         }
 
 
-def generate_health_recommendations(trip, traveler, covid_data, outbreaks, vaccines, healthcare, risk_score):
+async def generate_health_recommendations(trip, traveler, covid_data, outbreaks, vaccines, healthcare, risk_score):
     """
     Generate actionable health recommendations using LLM
     Falls back to simple rules if LLM is unavailable
     """
     
+    vaccines_ok = vaccines.get("status") == "success"
+    
     # Prepare data for LLM
     health_risk_data = {
-        "destination": trip.destination_country if hasattr(trip, "destination_country") else "Unknown",
+        "destination": trip.destination_country,
         "health_conditions": traveler.health_conditions if traveler.health_conditions else "None reported",
-        "frequent_traveler": traveler.frequent_traveler if hasattr(traveler, "frequent_traveler") else False,
+        "frequent_traveler": traveler.frequent_traveler,
         "covid_data": covid_data if covid_data.get("status") == "success" else {},
         "disease_outbreaks": outbreaks.get("endemic_diseases", []) if outbreaks.get("status") == "success" else [],
-        "required_vaccines": vaccines.get("required_vaccines", []) if vaccines.get("status") == "success" else [],
-        "recommended_vaccines": vaccines.get("recommended_vaccines", []) if vaccines.get("status") == "success" else [],
+        "required_vaccines": vaccines.get("required_vaccines", []) if vaccines_ok else [],
+        "recommended_vaccines": vaccines.get("recommended_vaccines", []) if vaccines_ok else [],
         "healthcare_quality": healthcare.get("healthcare_quality", "Unknown") if healthcare.get("status") == "success" else "Unknown",
     }
     
     # Try LLM-based recommendations
-    llm_recommendations = generate_health_recommendations_llm(health_risk_data)
+    llm_recommendations = await generate_health_recommendations_llm_async(health_risk_data)
     
     if llm_recommendations:
         # Use LLM-generated recommendations
@@ -176,9 +205,10 @@ def _generate_fallback_health_recommendations(covid_data, outbreaks, vaccines, h
     if outbreaks.get("status") == "success":
         endemic = outbreaks.get("endemic_diseases", [])
         if endemic and "Standard" not in str(endemic[0]):
-            if any("malaria" in d.lower() for d in endemic):
+            found = _mosquito_borne(tuple(endemic))
+            if "malaria" in found:
                 recommendations.append("Take malaria prophylaxis - start 1-2 days before departure")
-            if any("dengue" in d.lower() for d in endemic):
+            if "dengue" in found:
                 recommendations.append("Use insect repellent with DEET to prevent dengue/Zika")
     
     # Healthcare recommendations
@@ -4,21 +4,31 @@ Coordinates multiple risk analysis agents and aggregates their results
 """
 
 import asyncio
-import json
 import logging
-from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-from core.service.agents.weather_agent import weather_agent
+import numpy as np
+
+from core.service.agents.weather_agent import WeatherReport, weather_agent
 from core.service.agents.disease_agent import disease_agent
+from core.service.tools.disease_tools import get_covid_status_bulk, get_vaccination_requirements_bulk
 
 logger = logging.getLogger(__name__)
 
+# Weight of each agent's score (weather, disease) in the overall risk score
+AGENT_WEIGHTS = np.array([0.5, 0.5])
+
+# Appended to every consolidated recommendation list
+DEFAULT_RECOMMENDATIONS = (
+    "Maintain emergency contact information",
+    "Share trip itinerary with family/colleagues",
+)
+
 
-def orchestrator_agent(trip, traveler) -> dict:
+async def orchestrator_agent(trip, traveler) -> dict:
     """
     Main orchestrator that coordinates all risk analysis agents
-    Runs agents in parallel and aggregates results
+    Runs agents concurrently on the event loop and aggregates results
     
     Args:
         trip: Trip object
@@ -29,15 +39,22 @@ def orchestrator_agent(trip, traveler) -> dict:
     """
     
     try:
-        # Run agents in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit all agent tasks
-            weather_task = executor.submit(weather_agent, trip, traveler)
-            disease_task = executor.submit(disease_agent, trip, traveler)
-            
-            # Get results
-            weather_result = weather_task.result()
-            disease_result = disease_task.result()
+        # Run agents concurrently; a failing agent must not cancel the other
+        weather_result, disease_result = await asyncio.gather(
+            weather_agent(trip, traveler),
+            disease_agent(trip, traveler),
+            return_exceptions=True
+        )
+        
+        # Agent results become plain dicts here, where they join the stored/serialized report
+        if isinstance(weather_result, WeatherReport):
+            weather_result = weather_result.to_dict()
+        elif isinstance(weather_result, Exception):
+            logger.error(f"Weather agent error: {weather_result}")
+            weather_result = {"agent_name": "weather_climate", "status": "error", "message": str(weather_result)}
+        if isinstance(disease_result, Exception):
+            logger.error(f"Disease agent error: {disease_result}")
+            disease_result = {"agent_name": "health_disease", "status": "error", "message": str(disease_result)}
         
         # Aggregate results
         aggregated_report = aggregate_agent_results(
@@ -59,6 +76,42 @@ def orchestrator_agent(trip, traveler) -> dict:
         }
 
 
+async def batch_orchestrator(trips, traveler, concurrency: int = 8) -> List[dict]:
+    """
+    Analyze several trips of one traveler concurrently
+    At most `concurrency` trips are analyzed at once so a large batch does not
+    flood the external APIs; results are returned in the order of `trips`
+
+    Args:
+        trips: Iterable of Trip objects
+        traveler: Traveler object owning the trips
+        concurrency: Maximum number of trips analyzed at the same time
+
+    Returns:
+        list: One aggregated report per trip
+    """
+
+    trips = list(trips)
+    
+    # COVID data for all destinations in one request, vaccination requirements
+    # resolved together; the disease agents then find every country cached
+    countries = list(dict.fromkeys(trip.destination_country for trip in trips))
+    if len(countries) > 1:
+        await asyncio.gather(
+            get_covid_status_bulk(countries),
+            get_vaccination_requirements_bulk(countries)
+        )
+    
+    slots = asyncio.Semaphore(concurrency)
+
+    async def analyze(trip):
+        async with slots:
+            return await orchestrator_agent(trip, traveler)
+
+    # orchestrator_agent never raises; failures come back as error reports
+    return await asyncio.gather(*(analyze(trip) for trip in trips))
+
+
 def aggregate_agent_results(weather_report: dict, disease_report: dict, trip, traveler) -> dict:
     """
     Aggregate individual agent results into comprehensive report
@@ -73,12 +126,23 @@ def aggregate_agent_results(weather_report: dict, disease_report: dict, trip, tr
         dict: Aggregated risk report
     """
     
-    # Extract risk scores
-    weather_score = weather_report.get("risk_score", 25) if weather_report.get("status") == "success" else 25
-    disease_score = disease_report.get("risk_score", 25) if disease_report.get("status") == "success" else 25
+    # Read everything needed from each report in one pass; failed reports read as empty
+    weather = weather_report if weather_report.get("status") == "success" else {}
+    weather_score = weather.get("risk_score", 25)
+    weather_level = weather.get("risk_level")
+    weather_desc = weather.get("weather", {}).get("weather_description", "Unknown weather conditions")
+    air_quality = weather.get("air_quality", {})
+    weather_recs = weather.get("recommendations", [])
     
-    # Calculate overall risk score (average of agents)
-    overall_risk_score = int((weather_score + disease_score) / 2)
+    disease = disease_report if disease_report.get("status") == "success" else {}
+    disease_score = disease.get("risk_score", 25)
+    disease_level = disease.get("risk_level")
+    endemic = disease.get("disease_outbreaks", {}).get("endemic_diseases", [])
+    required_vaccines = disease.get("vaccination_requirements", {}).get("required", [])
+    disease_recs = disease.get("recommendations", [])
+    
+    # Calculate overall risk score (weighted average of agents)
+    overall_risk_score = int(AGENT_WEIGHTS @ (weather_score, disease_score))
     
     # Determine overall risk level
     if overall_risk_score < 30:
@@ -92,35 +156,23 @@ def aggregate_agent_results(weather_report: dict, disease_report: dict, trip, tr
     top_risks = []
     
     # From weather
-    if weather_report.get("status") == "success":
-        if weather_report.get("risk_level") in ["High", "Medium"]:
-            weather_desc = weather_report.get("weather", {}).get("weather_description", "Unknown weather conditions")
-            top_risks.append(f"Weather: {weather_desc}")
-        if weather_report.get("air_quality", {}).get("risk_component", 0) > 10:
-            top_risks.append(f"Air Quality: {weather_report.get('air_quality', {}).get('quality_level', 'Poor')}")
+    if weather_level in ("High", "Medium"):
+        top_risks.append(f"Weather: {weather_desc}")
+    if air_quality.get("risk_component", 0) > 10:
+        top_risks.append(f"Air Quality: {air_quality.get('quality_level', 'Poor')}")
     
     # From disease
-    if disease_report.get("status") == "success":
-        if disease_report.get("risk_level") in ["High", "Medium"]:
-            endemic = disease_report.get("disease_outbreaks", {}).get("endemic_diseases", [])
-            if endemic and "Standard" not in str(endemic[0]):
-                top_risks.append(f"Disease Risk: {', '.join(endemic[:2])}")
-        
-        required_vaccines = disease_report.get("vaccination_requirements", {}).get("required", [])
-        if required_vaccines and "None" not in str(required_vaccines[0]):
-            top_risks.append(f"Vaccination Required: {required_vaccines[0]}")
+    if disease_level in ("High", "Medium") and endemic and "Standard" not in str(endemic[0]):
+        top_risks.append(f"Disease Risk: {', '.join(endemic[:2])}")
+    if required_vaccines and "None" not in str(required_vaccines[0]):
+        top_risks.append(f"Vaccination Required: {required_vaccines[0]}")
     
     # Consolidate recommendations
-    consolidated_recommendations = []
-    
-    if weather_report.get("status") == "success":
-        consolidated_recommendations.extend(weather_report.get("recommendations", [])[:2])
-    
-    if disease_report.get("status") == "success":
-        consolidated_recommendations.extend(disease_report.get("recommendations", [])[:2])
-    
-    consolidated_recommendations.append("Maintain emergency contact information")
-    consolidated_recommendations.append("Share trip itinerary with family/colleagues")
+    consolidated_recommendations = [
+        *weather_recs[:2],
+        *disease_recs[:2],
+        *DEFAULT_RECOMMENDATIONS,
+    ]
     
     return {
         "status": "success",
@@ -185,31 +237,31 @@ def generate_executive_summary(risk_score: int, risk_level: str, top_risks: List
     
     duration = (trip.end_date - trip.start_date).days
     
-    summary_parts = [
-        f"Trip to {trip.destination_city}, {trip.destination_country} for {duration} days",
-        f"Overall Risk Level: {risk_level} (Score: {risk_score}/100)"
-    ]
-    
     if risk_level == "Low":
-        summary_parts.append(
-            "This destination presents minimal travel risks. Standard travel precautions recommended."
-        )
+        assessment = "This destination presents minimal travel risks. Standard travel precautions recommended."
     elif risk_level == "Medium":
-        summary_parts.append(
+        assessment = (
             "This destination presents moderate travel risks that require attention. "
             f"Key concerns: {', '.join(top_risks[:2])}. Review recommendations carefully."
         )
     else:  # High
-        summary_parts.append(
+        assessment = (
             "This destination presents significant travel risks. "
             f"Key concerns: {', '.join(top_risks[:3])}. "
             "Strongly recommend consulting travel health professionals before departure."
         )
     
+    summary_parts = [
+        f"Trip to {trip.destination_city}, {trip.destination_country} for {duration} days",
+        f"Overall Risk Level: {risk_level} (Score: {risk_score}/100)",
+        assessment,
+    ]
+    
     if traveler.health_conditions:
         summary_parts.append(
             f"Note: Traveler has reported health conditions ({traveler.health_conditions}). "
             "Consider impact on destination environment."
         )
     
+    # Single join of all parts
     return " ".join(summary_parts)
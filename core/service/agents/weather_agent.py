@@ -3,23 +3,74 @@ Weather and Climate Risk Agent
 Analyzes weather conditions, air quality, and natural disaster risks for the trip destination
 """
 
-import json
 import logging
-from core.service.tools.weather_tools import (
-    get_weather_forecast,
-    get_air_quality,
-    get_natural_disaster_risk
-)
-from core.service.tools.geo_tools import get_coordinates
+from dataclasses import asdict, dataclass, field
+from core.service.tools.weather_tools import gather_destination_data
 from core.service.llm_recommendations import (
-    generate_health_recommendations_llm,
+    generate_health_recommendations_llm_async,
     flatten_recommendations
 )
 
 logger = logging.getLogger(__name__)
 
 
-def weather_agent(trip, traveler) -> dict:
+@dataclass(slots=True)
+class WeatherSection:
+    avg_temperature: float | None
+    temperature_range: str | None
+    precipitation_mm: float | None
+    weather_description: str
+    risk_component: int
+
+
+@dataclass(slots=True)
+class AirQualitySection:
+    pm2_5: float | None
+    quality_level: str
+    health_impact: str | None
+    risk_component: int
+
+
+@dataclass(slots=True)
+class DisasterSection:
+    earthquake_risk: str
+    recent_activity: int
+    risk_component: int
+
+
+@dataclass(slots=True)
+class WeatherReport:
+    """Successful weather agent result; converted with to_dict() where it leaves the agents"""
+    agent_name: str = field(default="weather_climate", init=False)
+    status: str = field(default="success", init=False)
+    risk_score: int
+    risk_level: str
+    weather: WeatherSection
+    air_quality: AirQualitySection
+    natural_disasters: DisasterSection
+    traveler_health_considerations: list
+    recommendations: list
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# (condition keyword, trigger(weather, air_quality), message); matched against the
+# traveler's lowercased health conditions, tool results already passed through _ok()
+_HEALTH_RULES = (
+    ("asthma", lambda wd, aq: aq.get("risk_score", 0) > 10,
+     "Air pollution may worsen asthma symptoms"),
+    ("respiratory", lambda wd, aq: "heat" in (wd.get("weather_description") or "").lower(),
+     "High heat may affect respiratory condition"),
+)
+
+
+def _ok(result: dict) -> dict:
+    """A tool result if it succeeded, else an empty dict so lookups fall back to defaults"""
+    return result if result.get("status") == "success" else {}
+
+
+async def weather_agent(trip, traveler) -> WeatherReport | dict:
     """
     Agent that analyzes weather, climate, and natural disaster risks
     
@@ -28,14 +79,20 @@ def weather_agent(trip, traveler) -> dict:
         traveler: Traveler object with health conditions
         
     Returns:
-        dict: Structured risk assessment from weather perspective
+        WeatherReport: Structured risk assessment from weather perspective,
+        or an error dict if the analysis failed
     """
     
     try:
-        # Get coordinates for the destination
-        lat, lon = get_coordinates(trip.destination_city, trip.destination_country)
+        # Geocode, then fetch forecast, air quality and seismic risk together
+        destination_data = await gather_destination_data(
+            trip.destination_city,
+            trip.destination_country,
+            str(trip.start_date),
+            str(trip.end_date)
+        )
         
-        if lat is None or lon is None:
+        if destination_data is None:
             return {
                 "agent_name": "weather_climate",
                 "status": "error",
@@ -43,23 +100,15 @@ def weather_agent(trip, traveler) -> dict:
                 "message": "Could not determine destination coordinates"
             }
         
-        # Fetch weather data for trip dates
-        weather_data = get_weather_forecast(
-            lat, lon,
-            str(trip.start_date),
-            str(trip.end_date)
-        )
-        
-        # Get air quality
-        air_quality = get_air_quality(lat, lon)
+        weather_data, air_quality, disasters = destination_data
         
-        # Get natural disaster risk
-        disasters = get_natural_disaster_risk(lat, lon)
+        # Evaluate each tool's status once
+        wd, aq, dz = _ok(weather_data), _ok(air_quality), _ok(disasters)
         
         # Combine risk scores
-        weather_risk = weather_data.get("risk_score", 0) if weather_data.get("status") == "success" else 10
-        air_risk = air_quality.get("risk_score", 0) if air_quality.get("status") == "success" else 5
-        disaster_risk = disasters.get("risk_score", 0) if disasters.get("status") == "success" else 0
+        weather_risk = wd.get("risk_score", 0) if wd else 10
+        air_risk = aq.get("risk_score", 0) if aq else 5
+        disaster_risk = dz.get("risk_score", 0)
         
         # Total weather risk score (0-100)
         combined_risk = min((weather_risk + air_risk + disaster_risk) // 2, 100)
@@ -68,44 +117,38 @@ def weather_agent(trip, traveler) -> dict:
         risk_level = "Low" if combined_risk < 30 else ("Medium" if combined_risk < 60 else "High")
         
         # Health impact assessment for traveler
-        health_impact = []
-        if traveler.health_conditions:
-            if "asthma" in traveler.health_conditions.lower():
-                if air_quality.get("risk_score", 0) > 10:
-                    health_impact.append("Air pollution may worsen asthma symptoms")
-            if "respiratory" in traveler.health_conditions.lower():
-                if weather_data.get("weather_description"):
-                    if "heat" in weather_data.get("weather_description", "").lower():
-                        health_impact.append("High heat may affect respiratory condition")
+        conditions = (traveler.health_conditions or "").lower()
+        health_impact = [
+            message for keyword, triggered, message in _HEALTH_RULES
+            if keyword in conditions and triggered(wd, aq)
+        ]
         
-        return {
-            "agent_name": "weather_climate",
-            "status": "success",
-            "risk_score": combined_risk,
-            "risk_level": risk_level,
-            "weather": {
-                "avg_temperature": weather_data.get("avg_temperature") if weather_data.get("status") == "success" else None,
-                "temperature_range": f"{weather_data.get('min_temperature')}-{weather_data.get('max_temperature')}" if weather_data.get("status") == "success" else None,
-                "precipitation_mm": weather_data.get("total_precipitation_mm") if weather_data.get("status") == "success" else None,
-                "weather_description": weather_data.get("weather_description") if weather_data.get("status") == "success" else "Unknown",
-                "risk_component": weather_risk
-            },
-            "air_quality": {
-                "pm2_5": air_quality.get("pm2_5") if air_quality.get("status") == "success" else None,
-                "quality_level": air_quality.get("air_quality_level") if air_quality.get("status") == "success" else "Unknown",
-                "health_impact": air_quality.get("health_impact") if air_quality.get("status") == "success" else None,
-                "risk_component": air_risk
-            },
-            "natural_disasters": {
-                "earthquake_risk": disasters.get("earthquake_risk_level") if disasters.get("status") == "success" else "Unknown",
-                "recent_activity": disasters.get("recent_earthquakes_count") if disasters.get("status") == "success" else 0,
-                "risk_component": disaster_risk
-            },
-            "traveler_health_considerations": health_impact if health_impact else ["No specific health concerns"],
-            "recommendations": generate_weather_recommendations(
+        return WeatherReport(
+            risk_score=combined_risk,
+            risk_level=risk_level,
+            weather=WeatherSection(
+                avg_temperature=wd.get("avg_temperature"),
+                temperature_range=f"{wd.get('min_temperature')}-{wd.get('max_temperature')}" if wd else None,
+                precipitation_mm=wd.get("total_precipitation_mm"),
+                weather_description=wd.get("weather_description", "Unknown"),
+                risk_component=weather_risk
+            ),
+            air_quality=AirQualitySection(
+                pm2_5=aq.get("pm2_5"),
+                quality_level=aq.get("air_quality_level", "Unknown"),
+                health_impact=aq.get("health_impact"),
+                risk_component=air_risk
+            ),
+            natural_disasters=DisasterSection(
+                earthquake_risk=dz.get("earthquake_risk_level", "Unknown"),
+                recent_activity=dz.get("recent_earthquakes_count", 0),
+                risk_component=disaster_risk
+            ),
+            traveler_health_considerations=health_impact if health_impact else ["No specific health concerns"],
+            recommendations=await generate_weather_recommendations(
                 trip, weather_data, air_quality, disasters, combined_risk
             )
-        }
+        )
         
     except Exception as e:
         logger.error(f"Weather agent error: {e}")
@@ -117,28 +160,30 @@ def weather_agent(trip, traveler) -> dict:
         }
 
 
-def generate_weather_recommendations(trip, weather_data, air_quality, disasters, risk_score):
+async def generate_weather_recommendations(trip, weather_data, air_quality, disasters, risk_score):
     """
     Generate actionable weather recommendations using LLM
     Falls back to simple rules if LLM is unavailable
     """
     
+    wd, aq, dz = _ok(weather_data), _ok(air_quality), _ok(disasters)
+    
     # Prepare data for LLM
     weather_risk_data = {
-        "destination": trip.destination_country if hasattr(trip, "destination_country") else "Unknown",
-        "avg_temperature": weather_data.get("avg_temperature") if weather_data.get("status") == "success" else None,
-        "temperature_range": f"{weather_data.get('min_temperature')}-{weather_data.get('max_temperature')}" if weather_data.get("status") == "success" else None,
-        "precipitation_mm": weather_data.get("total_precipitation_mm") if weather_data.get("status") == "success" else 0,
-        "weather_description": weather_data.get("weather_description") if weather_data.get("status") == "success" else "Unknown",
-        "wind_speed_kmh": weather_data.get("max_wind_speed_kmh") if weather_data.get("status") == "success" else 0,
-        "pm2_5": air_quality.get("pm2_5") if air_quality.get("status") == "success" else None,
-        "air_quality_level": air_quality.get("air_quality_level") if air_quality.get("status") == "success" else "Unknown",
-        "earthquake_risk": disasters.get("earthquake_risk_level") if disasters.get("status") == "success" else "Unknown",
-        "recent_earthquakes": disasters.get("recent_earthquakes_count") if disasters.get("status") == "success" else 0,
+        "destination": trip.destination_country,
+        "avg_temperature": wd.get("avg_temperature"),
+        "temperature_range": f"{wd.get('min_temperature')}-{wd.get('max_temperature')}" if wd else None,
+        "precipitation_mm": wd.get("total_precipitation_mm", 0),
+        "weather_description": wd.get("weather_description", "Unknown"),
+        "wind_speed_kmh": wd.get("max_wind_speed_kmh", 0),
+        "pm2_5": aq.get("pm2_5"),
+        "air_quality_level": aq.get("air_quality_level", "Unknown"),
+        "earthquake_risk": dz.get("earthquake_risk_level", "Unknown"),
+        "recent_earthquakes": dz.get("recent_earthquakes_count", 0),
     }
     
     # Try LLM-based recommendations
-    llm_recommendations = generate_health_recommendations_llm(weather_risk_data)
+    llm_recommendations = await generate_health_recommendations_llm_async(weather_risk_data)
     
     if llm_recommendations:
         # Use LLM-generated recommendations
@@ -154,30 +199,31 @@ def generate_weather_recommendations(trip, weather_data, air_quality, disasters,
 def _generate_fallback_weather_recommendations(weather_data, air_quality, risk_score):
     """Fallback rule-based weather recommendation generator"""
     
-    recommendations = []
-    
-    if weather_data.get("status") == "success":
-        if weather_data.get("avg_temperature", 0) > 35:
-            recommendations.append("Pack light, breathable clothing and high SPF sunscreen")
-            recommendations.append("Stay hydrated - drink at least 3 liters of water daily")
-        
-        if weather_data.get("total_precipitation_mm", 0) > 100:
-            recommendations.append("Pack waterproof gear and plan for rainy days")
-            recommendations.append("Be cautious of flooding in low-lying areas")
-        
-        if weather_data.get("max_wind_speed_kmh", 0) > 50:
-            recommendations.append("Monitor weather alerts - strong winds possible")
-    
-    if air_quality.get("status") == "success":
-        if air_quality.get("risk_score", 0) > 15:
-            recommendations.append("Consider bringing N95 masks for air pollution protection")
-            recommendations.append("Limit outdoor activities during peak pollution hours")
+    wd, aq = _ok(weather_data), _ok(air_quality)
     
-    if risk_score > 50:
-        recommendations.append("Monitor weather and local alerts daily during trip")
-        recommendations.append("Share itinerary with emergency contacts")
+    # (condition, recommendations) pairs, emitted in this order when the condition holds
+    rules = (
+        (wd.get("avg_temperature", 0) > 35, (
+            "Pack light, breathable clothing and high SPF sunscreen",
+            "Stay hydrated - drink at least 3 liters of water daily",
+        )),
+        (wd.get("total_precipitation_mm", 0) > 100, (
+            "Pack waterproof gear and plan for rainy days",
+            "Be cautious of flooding in low-lying areas",
+        )),
+        (wd.get("max_wind_speed_kmh", 0) > 50, (
+            "Monitor weather alerts - strong winds possible",
+        )),
+        (aq.get("risk_score", 0) > 15, (
+            "Consider bringing N95 masks for air pollution protection",
+            "Limit outdoor activities during peak pollution hours",
+        )),
+        (risk_score > 50, (
+            "Monitor weather and local alerts daily during trip",
+            "Share itinerary with emergency contacts",
+        )),
+    )
     
-    if not recommendations:
-        recommendations.append("Standard weather precautions - monitor local forecast")
+    recommendations = [rec for matched, recs in rules if matched for rec in recs]
     
-    return recommendations
+    return recommendations or ["Standard weather precautions - monitor local forecast"]
@@ -0,0 +1,87 @@
+"""
+Background trip risk analysis
+analyze_risk only records a pending report and hands the orchestrator run to the
+background loop; the report row is updated when the run finishes
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import RiskAnalysisReport
+from core.service.agents.orchestrator import orchestrator_agent
+from core.service.background import submit
+
+logger = logging.getLogger(__name__)
+
+# A pending analysis not finished within this long is taken to be lost (e.g. the
+# process restarted) and a new analyze-risk request starts it again
+ANALYSIS_PENDING_TIMEOUT = timedelta(minutes=5)
+
+
+async def run_analysis(trip, traveler) -> None:
+    """Run the orchestrator for a trip and store the outcome on its report"""
+    try:
+        analysis_result = await orchestrator_agent(trip, traveler)
+    except Exception as e:
+        # orchestrator_agent reports its own failures; this only guards the report row
+        logger.error(f"Background analysis failed for trip {trip.id}: {e}")
+        analysis_result = {"status": "error", "message": f"Risk analysis failed: {e}"}
+
+    if analysis_result.get("status") == "success":
+        defaults = {
+            "status": "completed",
+            "error_message": "",
+            "completed_at": timezone.now(),
+            "overall_risk_score": analysis_result.get("overall_risk_score", 0),
+            "weather_risk_score": analysis_result.get("risk_score_breakdown", {}).get("weather_climate", 0),
+            "disease_risk_score": analysis_result.get("risk_score_breakdown", {}).get("health_disease", 0),
+            "full_report": analysis_result,
+            "top_risks": analysis_result.get("top_risks", []),
+            "recommendations": analysis_result.get("consolidated_recommendations", []),
+            "executive_summary": analysis_result.get("executive_summary", ""),
+            "weather_report": analysis_result.get("agent_reports", {}).get("weather_climate", {}),
+            "disease_report": analysis_result.get("agent_reports", {}).get("health_disease", {}),
+        }
+    else:
+        # The result of an earlier completed run is left as it is
+        defaults = {
+            "status": "failed",
+            "error_message": analysis_result.get("message", "Analysis failed"),
+        }
+
+    await RiskAnalysisReport.objects.aupdate_or_create(trip=trip, defaults=defaults)
+
+
+def claim_analysis(trip) -> tuple[int, bool]:
+    """
+    Mark the trip's report pending unless a run is already in progress
+    Returns the report id and whether this call claimed the run; the conditional
+    update and the trip's unique report row let only one concurrent request win
+    """
+    now = timezone.now()
+    claimed = bool(
+        RiskAnalysisReport.objects
+        .filter(trip=trip)
+        .exclude(status="pending", updated_at__gt=now - ANALYSIS_PENDING_TIMEOUT)
+        .update(status="pending", error_message="", updated_at=now)
+    )
+
+    if not claimed:
+        try:
+            with transaction.atomic():
+                RiskAnalysisReport.objects.create(trip=trip, status="pending")
+            claimed = True
+        except IntegrityError:
+            # The report exists, so its run is in progress (or another request just created it)
+            pass
+
+    report_id = RiskAnalysisReport.objects.values_list("id", flat=True).get(trip=trip)
+    return report_id, claimed
+
+
+def schedule_analysis(trip, traveler):
+    """Start the trip's analysis on the background loop"""
+    return submit(run_analysis(trip, traveler))
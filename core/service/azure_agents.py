@@ -0,0 +1,106 @@
+"""
+Shared helpers for Azure AI Foundry agent runs
+"""
+
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+__all__ = ["get_credential", "get_project_client", "get_or_create_agent", "run_agent"]
+
+# Run states after which polling stops
+TERMINAL_RUN_STATUSES = frozenset({"completed", "failed", "cancelled", "expired", "requires_action"})
+
+POLL_INITIAL_DELAY = 0.05
+POLL_MAX_DELAY = 0.5
+
+# Client-side cap on concurrent runs, so bursts queue here instead of hitting 429s
+_run_slots = threading.BoundedSemaphore(settings.AZURE_LLM_CONCURRENCY)
+
+# Runs failed with rate_limit_exceeded are retried after 1 s, 2 s, 4 s
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# The Azure SDK imports are deferred to first use; they are heavy and most
+# processes (management commands, mocked tests) never talk to Azure
+
+
+@lru_cache(maxsize=1)
+def get_credential():
+    """Process-wide service principal credential; one instance so its token cache is shared"""
+    from azure.identity import ClientSecretCredential
+
+    return ClientSecretCredential(
+        tenant_id=settings.AZURE_TENANT_ID,
+        client_id=settings.AZURE_CLIENT_ID,
+        client_secret=settings.AZURE_CLIENT_SECRET,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_project_client():
+    """Process-wide Azure AI Project client, reused so its connections stay open"""
+    from azure.ai.projects import AIProjectClient
+
+    return AIProjectClient(
+        credential=get_credential(),
+        endpoint=settings.AZURE_OPENAI_ENDPOINT
+    )
+
+
+# (endpoint, model, name, instructions) -> agent id, filled once per process
+_agent_ids = {}
+_agent_ids_lock = threading.Lock()
+
+
+def get_or_create_agent(project, name: str, instructions: str) -> str:
+    """
+    Return the id of the agent with this name and instructions on the configured model
+    The agent is created on first use and reused by every later run
+    """
+    key = (settings.AZURE_OPENAI_ENDPOINT, settings.AZURE_OPENAI_MODEL, name, instructions)
+    agent_id = _agent_ids.get(key)
+    if agent_id is None:
+        with _agent_ids_lock:
+            agent_id = _agent_ids.get(key)
+            if agent_id is None:
+                agent = project.agents.create_agent(
+                    model=settings.AZURE_OPENAI_MODEL,
+                    name=name,
+                    instructions=instructions,
+                )
+                agent_id = _agent_ids[key] = agent.id
+    return agent_id
+
+
+def _is_rate_limited(run) -> bool:
+    return run.status == "failed" and getattr(run.last_error, "code", None) == "rate_limit_exceeded"
+
+
+def run_agent(project, thread_id: str, agent_id: str):
+    """
+    Start an agent run on a thread and wait until it reaches a terminal state
+    Polls with exponential backoff (50 ms doubling up to 500 ms) so short runs
+    are picked up as soon as they finish. At most AZURE_LLM_CONCURRENCY runs are
+    in flight per process, and runs failed by rate limiting are retried with backoff
+
+    Returns:
+        ThreadRun: The finished run; callers check run.status
+    """
+    for retry in range(RATE_LIMIT_RETRIES + 1):
+        with _run_slots:
+            run = project.agents.runs.create(thread_id=thread_id, agent_id=agent_id)
+
+            attempt = 0
+            while run.status not in TERMINAL_RUN_STATUSES:
+                time.sleep(min(POLL_INITIAL_DELAY * 2 ** attempt, POLL_MAX_DELAY))
+                attempt += 1
+                run = project.agents.runs.get(thread_id=thread_id, run_id=run.id)
+
+        if not _is_rate_limited(run) or retry == RATE_LIMIT_RETRIES:
+            return run
+
+        # Wait outside the slot so other runs can proceed meanwhile
+        time.sleep(RATE_LIMIT_BACKOFF * 2 ** retry)
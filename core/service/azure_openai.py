@@ -1,11 +1,12 @@
-import os
-from openai import AzureOpenAI
-from azure.identity import ClientSecretCredential
-from django.conf import settings
-import json
-import time
-from django.conf import settings
-from azure.ai.projects import AIProjectClient
+import orjson
+import logging
+import msgspec
+
+from core.service.azure_agents import get_or_create_agent, get_project_client, run_agent
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RiskAnalysisResult", "analyze_trip_risk"]
 
 
 RISK_ANALYSIS_INSTRUCTIONS = """
@@ -40,36 +41,40 @@ The response MUST strictly follow this schema:
 
 Do not include any explanation outside the JSON.
 """
-def _get_project_client():
-    credential = ClientSecretCredential(
-        tenant_id=settings.AZURE_TENANT_ID,
-        client_id=settings.AZURE_CLIENT_ID,
-        client_secret=settings.AZURE_CLIENT_SECRET,
-    )
 
 
+class PoliticalWarRisk(msgspec.Struct):
+    level: str
+    summary: str
 
-    return AIProjectClient(
-        credential=credential,
-        endpoint=settings.AZURE_OPENAI_ENDPOINT
-    )
+
+class SectionRisk(msgspec.Struct):
+    risk_level: str
+    notes: str
+
+
+class RiskAnalysisResult(msgspec.Struct):
+    """Mirrors the schema in RISK_ANALYSIS_INSTRUCTIONS; decoding validates the agent's reply"""
+    overall_risk_score: int | float
+    risk_level: str
+    political_and_war_risk: PoliticalWarRisk
+    labour_law_and_immigration: SectionRisk
+    health_and_safety: SectionRisk
+    key_risk_factors: str
+    recommendations: str
 
 
 def analyze_trip_risk(trip, traveler):
     """
     Analyze trip risk using Azure AI Foundry.
-    Returns structured JSON.
+    Returns a RiskAnalysisResult, or the raw reply text if it does not match the schema.
     Does NOT store anything in DB.
     """
 
-    project = _get_project_client()
+    project = get_project_client()
 
-    # 1️⃣ Create agent
-    agent = project.agents.create_agent(
-        model=settings.AZURE_OPENAI_MODEL,  # gpt-4o-mini
-        name="Trip-Risk-Analyzer",
-        instructions=RISK_ANALYSIS_INSTRUCTIONS,
-    )
+    # 1️⃣ Get (or create once) the agent
+    agent_id = get_or_create_agent(project, "Trip-Risk-Analyzer", RISK_ANALYSIS_INSTRUCTIONS)
 
     # 2️⃣ Create thread
     thread = project.agents.threads.create()
@@ -85,8 +90,8 @@ def analyze_trip_risk(trip, traveler):
         "trip": {
             "destination_country": trip.destination_country,
             "destination_city": trip.destination_city,
-            "start_date": str(trip.start_date),
-            "end_date": str(trip.end_date),
+            "start_date": trip.start_date,
+            "end_date": trip.end_date,
             "purpose": trip.purpose,
             "transport_mode": trip.transport_mode,
             "accommodation": trip.accommodation,
@@ -98,42 +103,32 @@ def analyze_trip_risk(trip, traveler):
     project.agents.messages.create(
         thread_id=thread.id,
         role="user",
-        content=json.dumps(payload),
-    )
-
-    # 5️⃣ Run agent
-    run = project.agents.runs.create_and_process(
-        thread_id=thread.id,
-        agent_id=agent.id,
+        content=orjson.dumps(payload).decode(),
     )
 
-    # 6️⃣ Poll until completion
-    while True:
-        response = project.agents.runs.get(
-            thread_id=thread.id,
-            run_id=run.id,
-        )
-
-        if response.status in ("completed", "failed"):
-            break
-
-        time.sleep(0.5)
+    # 5️⃣ Run agent and wait for completion
+    response = run_agent(project, thread.id, agent_id)
 
     if response.status != "completed":
         raise RuntimeError("Azure AI Foundry risk analysis failed")
 
-    # 7️⃣ Fetch assistant response
-    messages = list(project.agents.messages.list(thread_id=thread.id))
+    # 6️⃣ Fetch assistant response
+    # Only this run's newest message is needed; the page is fetched lazily
+    messages = project.agents.messages.list(
+        thread_id=thread.id,
+        run_id=response.id,
+        order="desc",
+        limit=1,
+    )
     
-    for msg in reversed(messages):
+    for msg in messages:
         if msg.role == "assistant":
             try:
                 raw_data = msg.content[0].text.value
-                # Parse the JSON string, removing escape characters
-                parsed_data = json.loads(raw_data)
-                return parsed_data
+                # Parse and validate against the schema in one pass
+                return msgspec.json.decode(raw_data, type=RiskAnalysisResult)
             except Exception as e:
-                print(f"Failed to convert msg into json format: {e}")
+                logger.warning("Failed to convert msg into json format: %s", e)
                 return msg.content[0].text.value
          
 
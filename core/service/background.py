@@ -0,0 +1,30 @@
+"""
+Background event loop for work that outlives the request that started it
+One loop on a daemon thread, started on first use; it keeps its own pooled HTTP
+client, so consecutive background jobs reuse connections
+"""
+
+import asyncio
+import contextvars
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="core-background", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """Schedule a coroutine on the background loop; returns its concurrent.futures.Future"""
+    # Submitted from an empty context: the task must not inherit the request's
+    # asgiref executor, which is gone by the time the coroutine's ORM/cache calls run
+    return contextvars.Context().run(asyncio.run_coroutine_threadsafe, coro, _get_loop())
@@ -3,15 +3,29 @@ LLM-based recommendation generator
 Uses Azure OpenAI to generate intelligent health recommendations based on risk data
 """
 
-import json
+import asyncio
+import hashlib
 import logging
-import time
-from azure.identity import ClientSecretCredential
-from django.conf import settings
-from azure.ai.projects import AIProjectClient
+from itertools import chain
+from string import Template
+import orjson
+from django.core.cache import cache
+
+from core.service.azure_agents import get_or_create_agent, get_project_client, run_agent
 
 logger = logging.getLogger(__name__)
 
+RECOMMENDATION_CACHE_TIMEOUT = 3600
+
+# Keys of the LLM reply, in the order they are flattened
+RECOMMENDATION_CATEGORIES = (
+    "critical_recommendations",
+    "vaccination_advice",
+    "health_precautions",
+    "daily_practices",
+    "emergency_preparedness",
+)
+
 
 HEALTH_RECOMMENDATION_INSTRUCTIONS = """
 You are a travel health and disease risk expert. Based on the health and disease risk analysis data provided, 
@@ -36,103 +50,105 @@ Return a JSON object with:
 Provide only valid JSON, no other text.
 """
 
+# Per-request user message; JSON sections are sent compact, the model doesn't need the indentation
+HEALTH_RECOMMENDATION_PROMPT = Template("""
+Destination: $destination
+Traveler Health Conditions: $health_conditions
+Frequent Traveler: $frequent_traveler
 
-def _get_project_client():
-    """Get Azure AI Project client"""
-    credential = ClientSecretCredential(
-        tenant_id=settings.AZURE_TENANT_ID,
-        client_id=settings.AZURE_CLIENT_ID,
-        client_secret=settings.AZURE_CLIENT_SECRET,
-    )
-    
-    return AIProjectClient(
-        credential=credential,
-        endpoint=settings.AZURE_OPENAI_ENDPOINT
+COVID-19 Status:
+$covid_data
+
+Endemic Diseases:
+$disease_outbreaks
+
+Vaccination Requirements:
+- Required: $required_vaccines
+- Recommended: $recommended_vaccines
+
+Healthcare Quality: $healthcare_quality
+
+Please generate comprehensive health and safety recommendations for this traveler.
+""")
+
+
+def recommendation_cache_key(health_risk_data: dict) -> str:
+    """Cache key for the recommendations of one health risk input, independent of key order"""
+    payload = orjson.dumps(health_risk_data, default=str, option=orjson.OPT_SORT_KEYS)
+    return "hrec:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def build_health_recommendation_prompt(health_risk_data: dict) -> str:
+    """User message asking for recommendations for one traveler's health risk data"""
+    return HEALTH_RECOMMENDATION_PROMPT.substitute(
+        destination=health_risk_data.get('destination', 'Unknown'),
+        health_conditions=health_risk_data.get('health_conditions', 'None reported'),
+        frequent_traveler=health_risk_data.get('frequent_traveler', False),
+        covid_data=orjson.dumps(health_risk_data.get('covid_data', {}), default=str).decode(),
+        disease_outbreaks=orjson.dumps(health_risk_data.get('disease_outbreaks', {}), default=str).decode(),
+        required_vaccines=', '.join(health_risk_data.get('required_vaccines', [])),
+        recommended_vaccines=', '.join(health_risk_data.get('recommended_vaccines', [])),
+        healthcare_quality=health_risk_data.get('healthcare_quality', 'Unknown'),
     )
 
 
-def generate_health_recommendations_llm(health_risk_data: dict) -> dict:
+def generate_health_recommendations_llm(health_risk_data: dict, bypass_cache: bool = False) -> dict:
     """
     Use LLM to generate intelligent health recommendations based on disease/health risk data
+    Results are cached per distinct input for RECOMMENDATION_CACHE_TIMEOUT seconds
     
     Args:
         health_risk_data: Dict containing COVID status, diseases, vaccines, healthcare info
+        bypass_cache: Skip the cache lookup and always call the LLM (the result is still cached)
         
     Returns:
         dict: Structured recommendations from LLM
     """
     
+    cache_key = recommendation_cache_key(health_risk_data)
+    if not bypass_cache:
+        recommendations = cache.get(cache_key)
+        if recommendations is not None:
+            return recommendations
+    
     try:
-        project = _get_project_client()
+        project = get_project_client()
         
-        # Create agent
-        agent = project.agents.create_agent(
-            model=settings.AZURE_OPENAI_MODEL,
-            name="Health-Recommendation-Agent",
-            instructions=HEALTH_RECOMMENDATION_INSTRUCTIONS,
-        )
+        # Get (or create once) the agent
+        agent_id = get_or_create_agent(project, "Health-Recommendation-Agent", HEALTH_RECOMMENDATION_INSTRUCTIONS)
         
         # Create thread
         thread = project.agents.threads.create()
         
-        # Build the prompt with health data
-        prompt = f"""
-Destination: {health_risk_data.get('destination', 'Unknown')}
-Traveler Health Conditions: {health_risk_data.get('health_conditions', 'None reported')}
-Frequent Traveler: {health_risk_data.get('frequent_traveler', False)}
-
-COVID-19 Status:
-{json.dumps(health_risk_data.get('covid_data', {}), indent=2)}
-
-Endemic Diseases:
-{json.dumps(health_risk_data.get('disease_outbreaks', {}), indent=2)}
-
-Vaccination Requirements:
-- Required: {', '.join(health_risk_data.get('required_vaccines', []))}
-- Recommended: {', '.join(health_risk_data.get('recommended_vaccines', []))}
-
-Healthcare Quality: {health_risk_data.get('healthcare_quality', 'Unknown')}
-
-Please generate comprehensive health and safety recommendations for this traveler.
-"""
-        
         # Send message to agent
         project.agents.messages.create(
             thread_id=thread.id,
             role="user",
-            content=prompt,
-        )
-        
-        # Run agent
-        run = project.agents.runs.create_and_process(
-            thread_id=thread.id,
-            agent_id=agent.id,
+            content=build_health_recommendation_prompt(health_risk_data),
         )
         
-        # Poll until completion
-        while True:
-            response = project.agents.runs.get(
-                thread_id=thread.id,
-                run_id=run.id,
-            )
-            
-            if response.status in ("completed", "failed"):
-                break
-            
-            time.sleep(0.5)
+        # Run agent and wait for completion
+        response = run_agent(project, thread.id, agent_id)
         
         if response.status != "completed":
             logger.error("LLM recommendation generation failed")
             return None
         
         # Extract response
-        messages = list(project.agents.messages.list(thread_id=thread.id))
+        # Only this run's newest message is needed; the page is fetched lazily
+        messages = project.agents.messages.list(
+            thread_id=thread.id,
+            run_id=response.id,
+            order="desc",
+            limit=1,
+        )
         
-        for msg in reversed(messages):
+        for msg in messages:
             if msg.role == "assistant":
                 try:
                     raw_data = msg.content[0].text.value
-                    recommendations = json.loads(raw_data)
+                    recommendations = orjson.loads(raw_data)
+                    cache.set(cache_key, recommendations, RECOMMENDATION_CACHE_TIMEOUT)
                     return recommendations
                 except Exception as e:
                     logger.error(f"Failed to parse LLM recommendations: {e}")
@@ -145,6 +161,30 @@ Please generate comprehensive health and safety recommendations for this travele
         return None
 
 
+async def generate_health_recommendations_llm_async(health_risk_data: dict, bypass_cache: bool = False) -> dict:
+    """Awaitable generate_health_recommendations_llm; the blocking Azure SDK calls run in a worker thread"""
+    return await asyncio.to_thread(generate_health_recommendations_llm, health_risk_data, bypass_cache)
+
+
+async def generate_health_recommendations_llm_batch(health_risk_data_list, bypass_cache: bool = False) -> list:
+    """
+    Generate recommendations for several travelers concurrently
+    The agent runs overlap instead of queuing one after another; run_agent still
+    caps how many are in flight at once
+    
+    Args:
+        health_risk_data_list: Iterable of health risk data dicts
+        bypass_cache: Passed through to each generation
+        
+    Returns:
+        list: One recommendations dict (or None on failure) per input, in input order
+    """
+    return await asyncio.gather(*(
+        generate_health_recommendations_llm_async(health_risk_data, bypass_cache)
+        for health_risk_data in health_risk_data_list
+    ))
+
+
 def flatten_recommendations(llm_recommendations: dict) -> list:
     """
     Flatten LLM recommendations into a simple list
@@ -159,22 +199,8 @@ def flatten_recommendations(llm_recommendations: dict) -> list:
     if not llm_recommendations:
         return []
     
-    recommendations = []
-    
-    # Add in priority order
-    if llm_recommendations.get("critical_recommendations"):
-        recommendations.extend(llm_recommendations["critical_recommendations"])
-    
-    if llm_recommendations.get("vaccination_advice"):
-        recommendations.extend(llm_recommendations["vaccination_advice"])
-    
-    if llm_recommendations.get("health_precautions"):
-        recommendations.extend(llm_recommendations["health_precautions"])
-    
-    if llm_recommendations.get("daily_practices"):
-        recommendations.extend(llm_recommendations["daily_practices"])
-    
-    if llm_recommendations.get("emergency_preparedness"):
-        recommendations.extend(llm_recommendations["emergency_preparedness"])
-    
-    return recommendations
+    # Categories in priority order
+    return list(chain.from_iterable(
+        llm_recommendations.get(category) or ()
+        for category in RECOMMENDATION_CATEGORIES
+    ))
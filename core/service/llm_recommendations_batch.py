@@ -0,0 +1,162 @@
+"""
+Bulk LLM recommendation generation through the Azure OpenAI Batch API
+For latency-insensitive jobs such as regenerating recommendations for every trip:
+the requests are submitted as one batch (24 h window, about half the per-token
+cost) instead of one agent run each
+"""
+
+import logging
+from functools import lru_cache
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+
+from core.service.azure_agents import get_project_client
+from core.service.llm_recommendations import (
+    HEALTH_RECOMMENDATION_INSTRUCTIONS,
+    RECOMMENDATION_CACHE_TIMEOUT,
+    build_health_recommendation_prompt,
+    flatten_recommendations,
+    recommendation_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["submit_batch", "poll_and_collect", "cancel_batch"]
+
+BATCH_ENDPOINT = "/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Transient failures (connection errors, 429, 5xx) of the file and batch calls are
+# retried by the openai client with exponential backoff
+BATCH_MAX_RETRIES = 3
+
+# Batch states after which polling stops; only "completed" has an output file
+TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Process-wide AzureOpenAI client of the project, authenticated with its credential"""
+    client = get_project_client().get_openai_client(api_version=settings.AZURE_OPENAI_API_VERSION)
+    return client.with_options(max_retries=BATCH_MAX_RETRIES)
+
+
+def _batch_request(custom_id: str, health_risk_data: dict) -> dict:
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": settings.AZURE_OPENAI_BATCH_DEPLOYMENT_NAME,
+            "messages": [
+                {"role": "system", "content": HEALTH_RECOMMENDATION_INSTRUCTIONS},
+                {"role": "user", "content": build_health_recommendation_prompt(health_risk_data)},
+            ],
+            "response_format": {"type": "json_object"},
+        },
+    }
+
+
+def submit_batch(health_risk_data_list) -> str:
+    """
+    Submit recommendation requests for several travelers as one batch job
+    Each request's custom_id is recommendation_cache_key() of its input, so identical
+    inputs are sent once and results can be matched back to inputs
+
+    Args:
+        health_risk_data_list: Iterable of health risk data dicts
+
+    Returns:
+        str: The batch id, for poll_and_collect
+    """
+    requests = {
+        recommendation_cache_key(health_risk_data): health_risk_data
+        for health_risk_data in health_risk_data_list
+    }
+
+    # One JSON request per line, as the Batch API expects
+    jsonl = b"".join(
+        orjson.dumps(_batch_request(custom_id, health_risk_data)) + b"\n"
+        for custom_id, health_risk_data in requests.items()
+    )
+
+    client = get_openai_client()
+    input_file = client.files.create(
+        file=("health_recommendations.jsonl", jsonl, "application/jsonl"),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+
+    logger.info(f"Submitted recommendation batch {batch.id} with {len(requests)} requests")
+    return batch.id
+
+
+def poll_and_collect(batch_id: str) -> tuple:
+    """
+    Check a submitted batch once and collect its results when it has completed
+    Each collected recommendation is also cached, so later
+    generate_health_recommendations_llm calls for the same input skip the LLM
+
+    Args:
+        batch_id: Id returned by submit_batch
+
+    Returns:
+        tuple: (batch status, results); results is None until the batch has completed,
+        then a dict of custom_id -> flattened recommendation list (None for failed requests)
+    """
+    client = get_openai_client()
+    batch = client.batches.retrieve(batch_id)
+
+    if batch.status != "completed":
+        if batch.status in TERMINAL_BATCH_STATUSES:
+            logger.error(f"Recommendation batch {batch_id} ended with status {batch.status}")
+        return batch.status, None
+
+    results = {}
+
+    # Requests that failed outright are listed in the error file, if any
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+
+        for line in client.files.content(file_id).content.splitlines():
+            if not line.strip():
+                continue
+
+            item = orjson.loads(line)
+            response = item.get("response") or {}
+
+            if response.get("status_code") != 200:
+                results[item["custom_id"]] = None
+                continue
+
+            try:
+                raw_data = response["body"]["choices"][0]["message"]["content"]
+                recommendations = orjson.loads(raw_data)
+            except Exception as e:
+                logger.error(f"Failed to parse batch recommendation {item['custom_id']}: {e}")
+                results[item["custom_id"]] = None
+                continue
+
+            cache.set(item["custom_id"], recommendations, RECOMMENDATION_CACHE_TIMEOUT)
+            results[item["custom_id"]] = flatten_recommendations(recommendations)
+
+    return batch.status, results
+
+
+def cancel_batch(batch_id: str) -> str:
+    """
+    Cancel a submitted batch; requests already completed are still billed
+
+    Returns:
+        str: The batch status after the cancel request, usually "cancelling"
+    """
+    batch = get_openai_client().batches.cancel(batch_id)
+    logger.info(f"Cancelled recommendation batch {batch_id}")
+    return batch.status
@@ -0,0 +1,36 @@
+"""
+Background pre-warming of the destination tool caches
+Trips are saved well before anyone asks for their analysis, so the country and
+geocoding lookups are fetched then and analyze_risk finds them cached
+"""
+
+import asyncio
+import logging
+
+from django.db import transaction
+
+from core.service.background import submit
+from core.service.tools.disease_tools import get_covid_status, get_vaccination_requirements
+from core.service.tools.geo_tools import get_coordinates, get_country_code
+
+logger = logging.getLogger(__name__)
+
+
+async def prewarm_destination(city: str, country: str) -> None:
+    """Run the cached destination tools once so their results land in the cache"""
+    try:
+        await asyncio.gather(
+            get_coordinates(city, country),
+            get_country_code(country),
+            get_covid_status(country),
+            get_vaccination_requirements(country)
+        )
+    except Exception as e:
+        logger.warning(f"Cache pre-warm failed for {city}, {country}: {e}")
+
+
+def schedule_prewarm(trip) -> None:
+    """Pre-warm the trip's destination in the background once the current transaction commits"""
+    city, country = trip.destination_city, trip.destination_country
+    transaction.on_commit(lambda: submit(prewarm_destination(city, country)))
+
@@ -0,0 +1,70 @@
+"""
+Result caching for the external API tools
+Backed by the Django cache, so entries expire on their own and are shared per cache backend
+"""
+
+import functools
+import hashlib
+
+from django.core.cache import caches
+
+
+def cache_key(prefix: str, *parts) -> str:
+    """Key from the normalized (stripped, lowercased) arguments, hashed to stay backend-safe"""
+    normalized = "|".join(str(part or "").strip().lower() for part in parts)
+    return f"{prefix}:" + hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _is_success(result) -> bool:
+    return isinstance(result, dict) and result.get("status") == "success"
+
+
+def cached_tool(prefix: str, timeout: int, keep=_is_success, alias: str = "default"):
+    """
+    Cache an async tool's result per normalized positional arguments for `timeout` seconds
+    Only results accepted by `keep` are stored, so failed lookups are retried on the next call
+    `alias` selects the Django cache; use "persistent" for data that outlives the process
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args):
+            cache = caches[alias]
+            key = cache_key(prefix, *args)
+            result = await cache.aget(key)
+            if result is None:
+                result = await func(*args)
+                if keep(result):
+                    await cache.aset(key, result, timeout)
+            return result
+        return wrapper
+    return decorator
+
+
+def cached_bulk(prefix: str, timeout: int, single, keep=_is_success, alias: str = "default"):
+    """
+    Bulk form of a cached_tool sharing its cache entries (same prefix and alias)
+    The decorated async function gets the uncached items (two or more) and returns
+    {item: result}; a single uncached item goes through `single`, the cached tool itself
+    The wrapper takes an iterable of items and returns {item: result} in input order
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(items):
+            cache = caches[alias]
+            keys = {item: cache_key(prefix, item) for item in items}
+            cached = await cache.aget_many(keys.values())
+            results = {item: cached[key] for item, key in keys.items() if key in cached}
+
+            missing = [item for item in keys if item not in results]
+            if len(missing) == 1:
+                results[missing[0]] = await single(missing[0])
+            elif missing:
+                fetched = await func(missing)
+                await cache.aset_many(
+                    {keys[item]: result for item, result in fetched.items() if keep(result)}, timeout
+                )
+                results.update(fetched)
+
+            return {item: results[item] for item in keys}
+        return wrapper
+    return decorator
@@ -0,0 +1,53 @@
+"""
+Country name normalization for the static country tables
+Every ISO 3166 name, official name, common name and code maps to the alpha-3
+code, so "Vietnam", "Viet Nam", "VN" and "vnm" all land on the same key
+"""
+
+import pycountry
+
+# Everyday names ISO 3166 doesn't list
+COMMON_ALIASES = {
+    "uk": "GBR",
+    "u.k.": "GBR",
+    "great britain": "GBR",
+    "england": "GBR",
+    "scotland": "GBR",
+    "wales": "GBR",
+    "america": "USA",
+    "u.s.": "USA",
+    "u.s.a.": "USA",
+    "uae": "ARE",
+    "russia": "RUS",
+    "turkey": "TUR",
+    "ivory coast": "CIV",
+    "burma": "MMR",
+    "holland": "NLD",
+}
+
+
+def _build_aliases() -> dict:
+    aliases = {}
+    for country in pycountry.countries:
+        for attr in ("name", "official_name", "common_name", "alpha_2", "alpha_3"):
+            value = getattr(country, attr, None)
+            if value:
+                aliases[value.lower()] = country.alpha_3
+    aliases.update(COMMON_ALIASES)
+    return aliases
+
+
+# Lowercased alias -> ISO 3166-1 alpha-3 code, built once at import
+ALIAS_TO_CANONICAL = _build_aliases()
+
+# Alpha-3 code -> everyday name ("Vietnam" rather than "Viet Nam")
+COUNTRY_NAMES = {
+    country.alpha_3: getattr(country, "common_name", None) or country.name
+    for country in pycountry.countries
+}
+
+
+def canonical_country(country: str) -> str:
+    """Alpha-3 code for a known country name or code, else the stripped lowercased input"""
+    normalized = (country or "").strip().lower()
+    return ALIAS_TO_CANONICAL.get(normalized, normalized)
@@ -0,0 +1,67 @@
+"""
+Shared async HTTP client for the external API tools
+One httpx.AsyncClient per event loop so connections are pooled across tool calls
+"""
+
+import asyncio
+import weakref
+
+import httpx
+
+# Enough for every tool call of several concurrent analyses. Idle connections are
+# kept for 5 minutes: a request on a pooled connection skips the DNS lookup as well
+# as the TCP/TLS handshake, which is how repeat calls to the same few API hosts
+# avoid resolver latency (httpx has no DNS cache of its own)
+KEEPALIVE_EXPIRY = 300
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=KEEPALIVE_EXPIRY)
+
+# Requests to the same host (e.g. the Open-Meteo endpoints of one analysis) share a
+# single multiplexed HTTP/2 connection where the server supports it; others use HTTP/1.1
+HTTP2 = True
+
+# Connection failures (DNS, refused, TLS) are retried on a fresh connection
+CONNECT_RETRIES = 2
+
+# Fail fast on endpoints that don't accept connections; 5 s for each read/write/pool wait
+TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+# Upper bound on one get() including its retries, so a hanging API can't stall an agent
+REQUEST_DEADLINE = 8.0
+
+# Throttled or briefly unavailable upstreams are retried after 0.3 s, 0.6 s, 1.2 s
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+STATUS_RETRIES = 3
+STATUS_BACKOFF = 0.3
+
+# Clients are bound to the loop they were created on; entries go away with the loop
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the AsyncClient for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(http2=HTTP2, limits=LIMITS, retries=CONNECT_RETRIES)
+        )
+    return client
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """
+    GET through the shared client, retrying throttled and gateway errors with backoff
+    The last response is returned as-is once retries run out; raises TimeoutError
+    if the whole exchange takes longer than REQUEST_DEADLINE
+    """
+    client = get_client()
+    try:
+        async with asyncio.timeout(REQUEST_DEADLINE):
+            for retry in range(STATUS_RETRIES + 1):
+                response = await client.get(url, **kwargs)
+                if response.status_code not in RETRY_STATUSES or retry == STATUS_RETRIES:
+                    return response
+                await asyncio.sleep(STATUS_BACKOFF * 2 ** retry)
+    except TimeoutError:
+        raise TimeoutError(f"No response from {url} within {REQUEST_DEADLINE} s") from None
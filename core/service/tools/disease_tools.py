@@ -3,13 +3,141 @@ Disease and health tools for travel risk analysis
 Uses disease.sh API (FREE, no key needed) and other free health data sources
 """
 
-import requests
+import asyncio
 import logging
 
+import numpy as np
+import orjson
+
+from core.service.tools import _http
+from core.service.tools._cache import cached_bulk, cached_tool
+from core.service.tools._countries import ALIAS_TO_CANONICAL, COUNTRY_NAMES, canonical_country
+
 logger = logging.getLogger(__name__)
 
+# Case counts refresh often; entry requirements change rarely
+COVID_CACHE_TIMEOUT = 60 * 10
+VACCINATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# COVID risk by cases per million: values above THRESHOLDS[i - 1] fall in BANDS[i]
+COVID_CASES_THRESHOLDS = np.array([1000, 5000, 10000])
+COVID_BANDS = ((5, "Low"), (10, "Moderate"), (20, "High"), (25, "Very High"))
+
+# Common disease risks by region (simplified mapping)
+# In production, integrate with WHO or ProMED RSS
+REGIONAL_DISEASES = {
+    "Africa": ("Malaria", "Dengue", "Yellow Fever", "Ebola (specific regions)"),
+    "Asia": ("Dengue", "Malaria", "Zika", "Japanese Encephalitis", "Typhoid"),
+    "South America": ("Dengue", "Zika", "Malaria", "Yellow Fever"),
+    "Middle East": ("MERS-CoV", "Typhoid", "Hepatitis A"),
+    "Europe": ("Tick-borne encephalitis (Eastern)",),
+    "North America": ("Lyme Disease", "West Nile Virus"),
+}
+
+
+def _countries(*names) -> frozenset:
+    return frozenset(map(canonical_country, names))
+
+
+# Country tables below hold canonical_country() keys (ISO alpha-3 codes), so any
+# name or code of a listed country matches exactly, never as a substring
+AFRICA_COUNTRIES = _countries("egypt", "kenya", "nigeria", "south africa", "ghana", "ethiopia", "uganda")
+ASIA_COUNTRIES = _countries("thailand", "vietnam", "india", "philippines", "indonesia", "myanmar", "cambodia")
+AMERICAS_COUNTRIES = _countries("brazil", "colombia", "peru", "mexico")
+
+# Yellow Fever required/recommended list (simplified)
+YELLOW_FEVER_COUNTRIES = _countries(
+    "brazil", "peru", "bolivia", "venezuela", "colombia", "ecuador",
+    "guyana", "suriname", "french guiana", "egypt", "kenya", "uganda",
+)
+
+# Standard recommendations for all destinations
+BASE_RECOMMENDED_VACCINES = ("Hepatitis A", "Typhoid", "Routine Vaccinations")
+
+# Malaria risk countries
+MALARIA_COUNTRIES = _countries(
+    "nigeria", "kenya", "tanzania", "uganda", "ghana", "mozambique",
+    "zambia", "zimbabwe", "malawi", "thailand", "myanmar", "cambodia",
+)
+
+# Simplified healthcare quality assessment
+# In production, use WHO HAQ Index or similar metrics
+HIGH_QUALITY_HEALTHCARE = _countries(
+    "uk", "usa", "canada", "australia", "germany", "france",
+    "japan", "singapore", "south korea", "uae",
+)
+MEDIUM_QUALITY_HEALTHCARE = _countries(
+    "thailand", "mexico", "turkey", "brazil", "costa rica", "india", "philippines",
+)
+
+
+def _outbreak_result(risk_score: int, diseases: tuple) -> dict:
+    return {
+        "status": "success",
+        "risk_score": risk_score,
+        "endemic_diseases": diseases,
+        "vaccination_recommended": True if risk_score > 10 else False,
+        "consult_medical_advice": "Highly recommended" if risk_score > 20 else "Recommended"
+    }
+
+
+def _healthcare_result(quality_rating: str, accessibility: str, cost_level: str, risk_score: int) -> dict:
+    return {
+        "status": "success",
+        "healthcare_quality": quality_rating,
+        "accessibility": accessibility,
+        "estimated_cost_level": cost_level,
+        "risk_score": risk_score,
+        "recommendation": "Travel insurance highly recommended" if risk_score > 10 else "Travel insurance recommended"
+    }
+
 
-def get_covid_status(country: str) -> dict:
+def _by_country(*tiers) -> dict:
+    """Flatten (countries, result) tiers into one country -> result table; earlier tiers win"""
+    return {country: result for countries, result in reversed(tiers) for country in countries}
+
+
+# Decision tables, built once: every result the static tools can return, keyed by country
+OUTBREAKS_BY_COUNTRY = _by_country(
+    (AFRICA_COUNTRIES, _outbreak_result(25, REGIONAL_DISEASES["Africa"])),
+    (ASIA_COUNTRIES, _outbreak_result(20, REGIONAL_DISEASES["Asia"])),
+    (AMERICAS_COUNTRIES, _outbreak_result(15, REGIONAL_DISEASES["South America"])),
+)
+DEFAULT_OUTBREAKS = _outbreak_result(5, ("Standard travel vaccinations recommended",))
+
+HEALTHCARE_BY_COUNTRY = _by_country(
+    (HIGH_QUALITY_HEALTHCARE, _healthcare_result("Excellent", "Excellent", "High", 0)),
+    (MEDIUM_QUALITY_HEALTHCARE, _healthcare_result("Good", "Good", "Moderate", 5)),
+)
+DEFAULT_HEALTHCARE = _healthcare_result("Fair", "Limited in remote areas", "Low to Moderate", 15)
+
+
+COVID_NOT_FOUND = {"status": "error", "message": "Country not found", "risk_score": 0}
+
+
+def _covid_result(data: dict) -> dict:
+    """Risk assessment from one disease.sh country record"""
+    # Calculate risk score based on cases and deaths
+    cases = data.get("cases", 0)
+    deaths = data.get("deaths", 0)
+    cases_per_million = data.get("casesPerOneMillion", 0)
+    
+    risk_score, status = COVID_BANDS[np.searchsorted(COVID_CASES_THRESHOLDS, cases_per_million)]
+    
+    return {
+        "status": "success",
+        "risk_level": status,
+        "total_cases": cases,
+        "total_deaths": deaths,
+        "cases_per_million": round(cases_per_million, 0),
+        "updated": data.get("updated"),
+        "risk_score": risk_score,
+        "trend": "Check latest updates" if cases_per_million > 1000 else "Minimal concern"
+    }
+
+
+@cached_tool("covid", COVID_CACHE_TIMEOUT)
+async def get_covid_status(country: str) -> dict:
     """
     Get COVID-19 status for a country using disease.sh API (FREE)
     
@@ -22,50 +150,58 @@ def get_covid_status(country: str) -> dict:
     try:
         # Try to get country specific data
         url = f"https://disease.sh/v3/covid-19/countries/{country}"
-        response = requests.get(url, timeout=10)
+        response = await _http.get(url)
         
         if response.status_code == 200:
-            data = response.json()
-            
-            # Calculate risk score based on cases and deaths
-            cases = data.get("cases", 0)
-            deaths = data.get("deaths", 0)
-            cases_per_million = data.get("casesPerOneMillion", 0)
-            
-            risk_score = 0
-            status = "Low"
-            
-            if cases_per_million > 10000:
-                risk_score = 25
-                status = "Very High"
-            elif cases_per_million > 5000:
-                risk_score = 20
-                status = "High"
-            elif cases_per_million > 1000:
-                risk_score = 10
-                status = "Moderate"
-            else:
-                risk_score = 5
-                status = "Low"
-            
-            return {
-                "status": "success",
-                "risk_level": status,
-                "total_cases": cases,
-                "total_deaths": deaths,
-                "cases_per_million": round(cases_per_million, 0),
-                "updated": data.get("updated"),
-                "risk_score": risk_score,
-                "trend": "Check latest updates" if cases_per_million > 1000 else "Minimal concern"
-            }
-        
-        return {"status": "error", "message": "Country not found", "risk_score": 0}
+            return _covid_result(orjson.loads(response.content))
+        
+        return dict(COVID_NOT_FOUND)
         
     except Exception as e:
         logger.error(f"Error fetching COVID status: {e}")
         return {"status": "error", "message": str(e), "risk_score": 0}
 
 
+@cached_bulk("covid", COVID_CACHE_TIMEOUT, single=get_covid_status)
+async def get_covid_status_bulk(countries: list) -> dict:
+    """
+    Get COVID-19 status for several countries with a single disease.sh request
+    Countries already cached are not requested again
+    
+    Args:
+        countries: Country names
+        
+    Returns:
+        dict: Country name -> COVID-19 data and risk assessment, as from get_covid_status
+    """
+    try:
+        # disease.sh takes a comma-separated list and answers with one record per country found
+        url = "https://disease.sh/v3/covid-19/countries/" + ",".join(countries)
+        response = await _http.get(url)
+        
+        records = orjson.loads(response.content) if response.status_code == 200 else []
+        if isinstance(records, dict):
+            records = [records]
+        
+        # Matched on the canonical country either way, so "USA" finds the "United States" record
+        by_country = {}
+        for record in records:
+            by_country[canonical_country(record.get("country"))] = record
+            iso3 = (record.get("countryInfo") or {}).get("iso3")
+            if iso3:
+                by_country[iso3] = record
+        
+        results = {}
+        for country in countries:
+            record = by_country.get(canonical_country(country))
+            results[country] = _covid_result(record) if record else dict(COVID_NOT_FOUND)
+        return results
+        
+    except Exception as e:
+        logger.error(f"Error fetching COVID status: {e}")
+        return {country: {"status": "error", "message": str(e), "risk_score": 0} for country in countries}
+
+
 def get_disease_outbreaks(country: str) -> dict:
     """
     Get disease outbreak information for a country
@@ -81,54 +217,61 @@ def get_disease_outbreaks(country: str) -> dict:
         # Using disease.sh as aggregator for multiple diseases
         # Note: disease.sh primarily focuses on COVID, but we can check for other data
         
-        risk_score = 0
-        diseases = []
-        
-        # Common disease risks by region (simplified mapping)
-        # In production, integrate with WHO or ProMED RSS
-        regional_diseases = {
-            "Africa": ["Malaria", "Dengue", "Yellow Fever", "Ebola (specific regions)"],
-            "Asia": ["Dengue", "Malaria", "Zika", "Japanese Encephalitis", "Typhoid"],
-            "South America": ["Dengue", "Zika", "Malaria", "Yellow Fever"],
-            "Middle East": ["MERS-CoV", "Typhoid", "Hepatitis A"],
-            "Europe": ["Tick-borne encephalitis (Eastern)"],
-            "North America": ["Lyme Disease", "West Nile Virus"]
-        }
-        
-        # Check country against regions
-        africa_countries = ["Egypt", "Kenya", "Nigeria", "South Africa", "Ghana", "Ethiopia", "Uganda"]
-        asia_countries = ["Thailand", "Vietnam", "India", "Philippines", "Indonesia", "Myanmar", "Cambodia"]
-        americas_countries = ["Brazil", "Colombia", "Peru", "Mexico"]
-        
-        if any(c in country for c in africa_countries):
-            diseases = regional_diseases["Africa"]
-            risk_score = 25
-        elif any(c in country for c in asia_countries):
-            diseases = regional_diseases["Asia"]
-            risk_score = 20
-        elif any(c in country for c in americas_countries):
-            diseases = regional_diseases["South America"]
-            risk_score = 15
-        else:
-            risk_score = 5
-            diseases = ["Standard travel vaccinations recommended"]
+        result = OUTBREAKS_BY_COUNTRY.get(canonical_country(country), DEFAULT_OUTBREAKS)
         
-        return {
-            "status": "success",
-            "risk_score": risk_score,
-            "endemic_diseases": diseases,
-            "vaccination_recommended": True if risk_score > 10 else False,
-            "consult_medical_advice": "Highly recommended" if risk_score > 20 else "Recommended"
-        }
+        # Fresh dict and list so callers never share the table's entries
+        return {**result, "endemic_diseases": list(result["endemic_diseases"])}
         
     except Exception as e:
         logger.error(f"Error fetching disease outbreaks: {e}")
         return {"status": "error", "message": str(e), "risk_score": 0}
 
 
-def get_vaccination_requirements(country: str) -> dict:
+def _vaccination_result(key: str, country_name: str) -> dict:
+    """Requirements for a country by its canonical_country() key"""
+    # Common vaccines by region (simplified)
+    # In production, use WHO or official government sources
+    # Entries are distinct by construction, so no dedup pass is needed
+    required_vaccines = ["Yellow Fever"] if key in YELLOW_FEVER_COUNTRIES else []
+    recommended_vaccines = [
+        *(("Malaria Prophylaxis",) if key in MALARIA_COUNTRIES else ()),
+        *BASE_RECOMMENDED_VACCINES,
+    ]
+    
+    return {
+        "status": "success",
+        "country": country_name,
+        "required_vaccines": required_vaccines or ["None specific"],
+        "recommended_vaccines": recommended_vaccines,
+        "consult_before_days": 4 if required_vaccines else 2
+    }
+
+
+def _unlisted_vaccination_result(country: str) -> dict:
+    """Requirements for a country REST Countries doesn't know: the base vaccines only"""
+    return {
+        "status": "success",
+        "country": country,
+        "required_vaccines": ["None specific"],
+        "recommended_vaccines": list(BASE_RECOMMENDED_VACCINES),
+        "consult_before_days": 2
+    }
+
+
+def _vaccination_error(message: str) -> dict:
+    return {
+        "status": "error",
+        "message": message,
+        "required_vaccines": [],
+        "recommended_vaccines": ["Consult travel health professional"]
+    }
+
+
+@cached_tool("vax", VACCINATION_CACHE_TIMEOUT)
+async def get_vaccination_requirements(country: str) -> dict:
     """
-    Get vaccination requirements for a country using REST Countries API
+    Get vaccination requirements for a country
+    Names the alias table doesn't know are resolved with the REST Countries API
     
     Args:
         country: Country name
@@ -136,62 +279,60 @@ def get_vaccination_requirements(country: str) -> dict:
     Returns:
         dict: Vaccination requirements
     """
+    # Names and codes the alias table knows need no request
+    code = ALIAS_TO_CANONICAL.get(country.strip().lower())
+    if code is not None:
+        return _vaccination_result(code, COUNTRY_NAMES[code])
+    
     try:
-        # Try REST Countries API first
+        # Other spellings are resolved by REST Countries' name search
         url = f"https://restcountries.com/v3.1/name/{country}"
-        response = requests.get(url, timeout=10)
+        # Only the name field is read; the full country record is tens of KB
+        response = await _http.get(url, params={"fields": "name"})
         
         if response.status_code == 200:
-            data = response.json()[0]
-            
-            # Common vaccines by region (simplified)
-            # In production, use WHO or official government sources
+            data = orjson.loads(response.content)[0]
             country_name = data.get("name", {}).get("common", "")
-            
-            required_vaccines = []
-            recommended_vaccines = []
-            
-            # Yellow Fever required/recommended list (simplified)
-            yellow_fever_countries = ["Brazil", "Peru", "Bolivia", "Venezuela", "Colombia", "Ecuador",
-                                     "Guyana", "Suriname", "French Guiana", "Egypt", "Kenya", "Uganda"]
-            
-            # Malaria risk countries
-            malaria_countries = ["Nigeria", "Kenya", "Tanzania", "Uganda", "Ghana", "Mozambique",
-                               "Zambia", "Zimbabwe", "Malawi", "Thailand", "Myanmar", "Cambodia"]
-            
-            if any(c in country_name for c in yellow_fever_countries):
-                required_vaccines.append("Yellow Fever")
-            
-            if any(c in country_name for c in malaria_countries):
-                recommended_vaccines.append("Malaria Prophylaxis")
-            
-            # Standard recommendations for all
-            recommended_vaccines.extend(["Hepatitis A", "Typhoid", "Routine Vaccinations"])
-            
-            return {
-                "status": "success",
-                "country": country_name,
-                "required_vaccines": list(set(required_vaccines)) if required_vaccines else ["None specific"],
-                "recommended_vaccines": list(set(recommended_vaccines)),
-                "consult_before_days": 4 if required_vaccines else 2
-            }
-        
-        return {
-            "status": "success",
-            "country": country,
-            "required_vaccines": ["None specific"],
-            "recommended_vaccines": ["Hepatitis A", "Typhoid", "Routine Vaccinations"],
-            "consult_before_days": 2
-        }
+            return _vaccination_result(canonical_country(country_name), country_name)
+        
+        # Only a definite "no such country" is an answer; other statuses are
+        # outages, returned as errors so they aren't cached
+        if response.status_code == 404:
+            return _unlisted_vaccination_result(country)
+        
+        return _vaccination_error(f"REST Countries returned HTTP {response.status_code}")
         
     except Exception as e:
         logger.error(f"Error fetching vaccination requirements: {e}")
-        return {
-            "status": "error",
-            "message": str(e),
-            "required_vaccines": [],
-            "recommended_vaccines": ["Consult travel health professional"]
-        }
+        return _vaccination_error(str(e))
+
+
+@cached_bulk("vax", VACCINATION_CACHE_TIMEOUT, single=get_vaccination_requirements)
+async def get_vaccination_requirements_bulk(countries: list) -> dict:
+    """
+    Get vaccination requirements for several countries
+    Countries the alias table knows are answered locally; the others are looked
+    up concurrently. Countries already cached are not looked up again
+    
+    Args:
+        countries: Country names
+        
+    Returns:
+        dict: Country name -> vaccination requirements, as from get_vaccination_requirements
+    """
+    results = {}
+    unknown = []
+    for country in countries:
+        code = ALIAS_TO_CANONICAL.get(country.strip().lower())
+        if code is None:
+            unknown.append(country)
+        else:
+            results[country] = _vaccination_result(code, COUNTRY_NAMES[code])
+    
+    if unknown:
+        results.update(zip(unknown, await asyncio.gather(*map(get_vaccination_requirements, unknown))))
+    
+    return results
 
 
 def get_healthcare_quality(country: str) -> dict:
@@ -205,43 +346,8 @@ def get_healthcare_quality(country: str) -> dict:
         dict: Healthcare quality metrics
     """
     try:
-        # Simplified healthcare quality assessment
-        # In production, use WHO HAQ Index or similar metrics
-        
-        high_quality_countries = ["UK", "USA", "Canada", "Australia", "Germany", "France", 
-                                 "Japan", "Singapore", "South Korea", "UAE"]
-        medium_quality_countries = ["Thailand", "Mexico", "Turkey", "Brazil", "Costa Rica",
-                                   "India", "Philippines"]
-        
-        quality_rating = "High"
-        accessibility = "Good"
-        cost_level = "Moderate"
-        risk_score = 5
-        
-        if any(c in country for c in high_quality_countries):
-            quality_rating = "Excellent"
-            accessibility = "Excellent"
-            cost_level = "High"
-            risk_score = 0
-        elif any(c in country for c in medium_quality_countries):
-            quality_rating = "Good"
-            accessibility = "Good"
-            cost_level = "Moderate"
-            risk_score = 5
-        else:
-            quality_rating = "Fair"
-            accessibility = "Limited in remote areas"
-            cost_level = "Low to Moderate"
-            risk_score = 15
-        
-        return {
-            "status": "success",
-            "healthcare_quality": quality_rating,
-            "accessibility": accessibility,
-            "estimated_cost_level": cost_level,
-            "risk_score": risk_score,
-            "recommendation": "Travel insurance highly recommended" if risk_score > 10 else "Travel insurance recommended"
-        }
+        # All values are immutable, so a shallow copy fully detaches the result
+        return dict(HEALTHCARE_BY_COUNTRY.get(canonical_country(country), DEFAULT_HEALTHCARE))
         
     except Exception as e:
         logger.error(f"Error assessing healthcare quality: {e}")
@@ -3,15 +3,27 @@ Geocoding tools to convert city names to coordinates
 Uses free APIs with no rate limits
 """
 
-import requests
 import logging
 
+import orjson
+
+from core.service.tools import _http
+from core.service.tools._cache import cached_tool
+from core.service.tools._countries import ALIAS_TO_CANONICAL
+
 logger = logging.getLogger(__name__)
 
+# City coordinates and country codes don't move; keep them on disk for 30 days
+GEOCODE_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
 
-def get_coordinates(city: str, country: str) -> tuple:
+@cached_tool(
+    "geo", GEOCODE_CACHE_TIMEOUT, keep=lambda coordinates: coordinates[0] is not None, alias="persistent"
+)
+async def get_coordinates(city: str, country: str) -> tuple:
     """
     Get latitude and longitude for a city using Open-Meteo Geocoding API (FREE, no key needed)
+    Found coordinates are cached per normalized (city, country)
     
     Args:
         city: City name
@@ -29,10 +41,10 @@ def get_coordinates(city: str, country: str) -> tuple:
             "limit": 1
         }
         
-        response = requests.get(url, params=params, timeout=5)
+        response = await _http.get(url, params=params)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get("results") and len(data["results"]) > 0:
             result = data["results"][0]
@@ -46,9 +58,11 @@ def get_coordinates(city: str, country: str) -> tuple:
         return (None, None)
 
 
-def get_country_code(country: str) -> str:
+async def get_country_code(country: str) -> str:
     """
-    Get ISO country code for a country name using REST Countries API (FREE)
+    Get ISO country code for a country name
+    Known names and codes resolve from the in-memory alias table; only names it
+    doesn't know fall back to the REST Countries API (FREE)
     
     Args:
         country: Country name
@@ -56,17 +70,27 @@ def get_country_code(country: str) -> str:
     Returns:
         str: ISO 3166-1 alpha-3 country code (e.g., "USA", "GBR")
     """
+    code = ALIAS_TO_CANONICAL.get(country.strip().lower())
+    if code is not None:
+        return code
+    return await _lookup_country_code(country) or country.upper()[:3]
+
+
+@cached_tool("cca3", GEOCODE_CACHE_TIMEOUT, keep=bool, alias="persistent")
+async def _lookup_country_code(country: str) -> str | None:
+    """ISO alpha-3 code from REST Countries, or None if the lookup failed"""
     try:
         url = f"https://restcountries.com/v3.1/name/{country}"
-        response = requests.get(url, timeout=5)
+        # Only the cca3 field is read; the full country record is tens of KB
+        response = await _http.get(url, params={"fields": "cca3"})
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data and len(data) > 0:
                 return data[0].get("cca3", "").upper()
         
-        return country.upper()[:3]
+        return None
         
     except Exception as e:
         logger.error(f"Error fetching country code: {e}")
-        return country.upper()[:3]
+        return None
@@ -3,14 +3,106 @@ Weather and climate tools for travel risk analysis
 Uses Open-Meteo (FREE, no API key needed) and OpenWeatherMap free tier
 """
 
-import requests
+import asyncio
 import logging
-from datetime import datetime, timedelta
+
+import numpy as np
+import orjson
+
+from core.service.tools import _http
+from core.service.tools._cache import cached_tool
+from core.service.tools.geo_tools import get_coordinates
 
 logger = logging.getLogger(__name__)
 
+# Open-Meteo refreshes its forecast and air quality models hourly
+WEATHER_CACHE_TIMEOUT = 60 * 60
+AIR_QUALITY_CACHE_TIMEOUT = 60 * 60
+
+# Risk bands as (score, description): values above THRESHOLDS[i - 1] fall in BANDS[i],
+# looked up with np.searchsorted instead of if/elif ladders
+HEAT_THRESHOLDS = np.array([30, 35])
+HEAT_BANDS = ((0, None), (10, "High heat"), (15, "Extreme heat"))
+FREEZING_BAND = (10, "Below freezing temperatures")
+
+RAIN_THRESHOLDS = np.array([100, 200])
+RAIN_BANDS = ((0, None), (5, "Moderate rainfall"), (10, "Heavy rainfall"))
+
+WIND_THRESHOLDS = np.array([35, 50])
+WIND_BANDS = ((0, None), (10, "Windy conditions"), (15, "Strong winds/storm potential"))
+
+AQI_THRESHOLDS = np.array([25, 50, 75])
+AQI_BANDS = ((0, "Good"), (10, "Moderate"), (20, "Unhealthy for Sensitive Groups"), (25, "Very Unhealthy"))
+
+# Static seismic zone database based on global earthquake patterns
+# Zones are checked in order; the first whose bounding box contains the point wins
+SEISMIC_ZONES = (
+    {
+        "name": "Pacific Ring of Fire",
+        "latmin": -30, "latmax": 60, "lonmin": 100, "lonmax": 180,
+        "risk": "High", "score": 25, "avg_magnitude": 6.5
+    },
+    {
+        "name": "Mediterranean Belt",
+        "latmin": 30, "latmax": 45, "lonmin": -5, "lonmax": 40,
+        "risk": "Moderate", "score": 15, "avg_magnitude": 5.5
+    },
+    {
+        "name": "Alpine Himalayan Belt",
+        "latmin": 35, "latmax": 50, "lonmin": 0, "lonmax": 90,
+        "risk": "Moderate", "score": 15, "avg_magnitude": 5.0
+    },
+    {
+        "name": "East African Rift",
+        "latmin": -15, "latmax": 15, "lonmin": 20, "lonmax": 40,
+        "risk": "Moderate", "score": 12, "avg_magnitude": 5.0
+    },
+    {
+        "name": "Mid-Ocean Ridges",
+        "latmin": -90, "latmax": 90, "lonmin": -180, "lonmax": 180,
+        "risk": "Low", "score": 5, "avg_magnitude": 4.5
+    },
+)
+
+# Zone bounds as columns so a point is tested against every zone in one vectorized pass
+_ZONE_LATMIN, _ZONE_LATMAX, _ZONE_LONMIN, _ZONE_LONMAX = (
+    np.array([zone[bound] for zone in SEISMIC_ZONES], dtype=np.float64)
+    for bound in ("latmin", "latmax", "lonmin", "lonmax")
+)
+
+# Used when no zone contains the point
+STABLE_ZONE = {
+    "name": "Stable Continental Region",
+    "risk": "Low", "score": 0, "avg_magnitude": 3.5
+}
+
 
-def get_weather_forecast(latitude: float, longitude: float, start_date: str, end_date: str) -> dict:
+def _zone_result(zone: dict) -> dict:
+    return {
+        "status": "success",
+        "earthquake_risk_level": zone["risk"],
+        "recent_earthquakes_count": 0,
+        "max_magnitude_30days": zone.get("avg_magnitude", 3.5),
+        "risk_score": zone["score"],
+        "recent_activity": (),
+        "seismic_zone": zone.get("name", "Unknown"),
+        "source": "Global Seismic Zone Database"
+    }
+
+
+# Result for each zone, built once; indexed like SEISMIC_ZONES
+ZONE_RESULTS = tuple(_zone_result(zone) for zone in SEISMIC_ZONES)
+STABLE_ZONE_RESULT = _zone_result(STABLE_ZONE)
+
+
+def _series(values) -> np.ndarray:
+    """An Open-Meteo data series as a float array, with its null entries dropped"""
+    series = np.asarray(values, dtype=np.float64)
+    return series[~np.isnan(series)]
+
+
+@cached_tool("forecast", WEATHER_CACHE_TIMEOUT)
+async def get_weather_forecast(latitude: float, longitude: float, start_date: str, end_date: str) -> dict:
     """
     Get weather forecast using Open-Meteo API (FREE, no key needed)
     Uses current weather data instead of archive for more reliable results
@@ -38,61 +130,46 @@ def get_weather_forecast(latitude: float, longitude: float, start_date: str, end
             "forecast_days": 7
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = await _http.get(url, params=params)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if "daily" in data:
             daily_data = data["daily"]
-            temps = daily_data.get("temperature_2m_max", [])
-            min_temps = daily_data.get("temperature_2m_min", [])
-            precipitation = daily_data.get("precipitation_sum", [])
-            wind_speed = daily_data.get("windspeed_10m_max", [])
+            temps = _series(daily_data.get("temperature_2m_max", []))
+            min_temps = _series(daily_data.get("temperature_2m_min", []))
+            precipitation = _series(daily_data.get("precipitation_sum", []))
+            wind_speed = _series(daily_data.get("windspeed_10m_max", []))
             
-            avg_temp = sum(temps) / len(temps) if temps else 0
-            avg_min_temp = sum(min_temps) / len(min_temps) if min_temps else 0
-            total_rain = sum(precipitation) if precipitation else 0
-            max_wind = max(wind_speed) if wind_speed else 0
+            avg_temp = float(temps.mean()) if temps.size else 0
+            avg_min_temp = float(min_temps.mean()) if min_temps.size else 0
+            total_rain = float(precipitation.sum()) if precipitation.size else 0
+            max_wind = float(wind_speed.max()) if wind_speed.size else 0
             
             # Determine weather risk
-            risk_score = 0
-            weather_description = []
+            temperature_band = HEAT_BANDS[np.searchsorted(HEAT_THRESHOLDS, avg_temp)]
+            if avg_temp < 0:
+                temperature_band = FREEZING_BAND
             
-            if avg_temp > 35:
-                risk_score += 15
-                weather_description.append("Extreme heat")
-            elif avg_temp > 30:
-                risk_score += 10
-                weather_description.append("High heat")
-            elif avg_temp < 0:
-                risk_score += 10
-                weather_description.append("Below freezing temperatures")
-                
-            if total_rain > 200:
-                risk_score += 10
-                weather_description.append("Heavy rainfall")
-            elif total_rain > 100:
-                risk_score += 5
-                weather_description.append("Moderate rainfall")
+            bands = (
+                temperature_band,
+                RAIN_BANDS[np.searchsorted(RAIN_THRESHOLDS, total_rain)],
+                WIND_BANDS[np.searchsorted(WIND_THRESHOLDS, max_wind)],
+            )
+            risk_score = sum(score for score, _ in bands)
+            weather_description = [description for _, description in bands if description]
             
-            if max_wind > 50:
-                risk_score += 15
-                weather_description.append("Strong winds/storm potential")
-            elif max_wind > 35:
-                risk_score += 10
-                weather_description.append("Windy conditions")
-                
             return {
                 "status": "success",
                 "avg_temperature": round(avg_temp, 1),
                 "min_temperature": round(avg_min_temp, 1),
-                "max_temperature": round(max(temps), 1) if temps else None,
+                "max_temperature": round(float(temps.max()), 1) if temps.size else None,
                 "total_precipitation_mm": round(total_rain, 1),
                 "max_wind_speed_kmh": round(max_wind, 1),
                 "weather_description": " | ".join(weather_description) if weather_description else "Mild weather",
                 "risk_score": risk_score,
-                "days_analyzed": len(temps)
+                "days_analyzed": temps.size
             }
         
         return {"status": "error", "message": "No weather data available"}
@@ -102,7 +179,8 @@ def get_weather_forecast(latitude: float, longitude: float, start_date: str, end
         return {"status": "error", "message": str(e)}
 
 
-def get_air_quality(latitude: float, longitude: float) -> dict:
+@cached_tool("aq", AIR_QUALITY_CACHE_TIMEOUT)
+async def get_air_quality(latitude: float, longitude: float) -> dict:
     """
     Get air quality data using Open-Meteo Air Quality API (FREE)
     
@@ -123,36 +201,25 @@ def get_air_quality(latitude: float, longitude: float) -> dict:
             "timezone": "auto"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = await _http.get(url, params=params)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if "hourly" in data:
             hourly = data["hourly"]
             
-            pm25_list = hourly.get("pm2_5", [])
-            pm10_list = hourly.get("pm10", [])
-            aqi_list = hourly.get("european_aqi", [])
+            pm25_list = _series(hourly.get("pm2_5", []))
+            pm10_list = _series(hourly.get("pm10", []))
+            aqi_list = _series(hourly.get("european_aqi", []))
             
-            # Get average values
-            pm25 = sum(pm25_list) / len(pm25_list) if pm25_list else 0
-            pm10 = sum(pm10_list) / len(pm10_list) if pm10_list else 0
-            aqi = sum(aqi_list) / len(aqi_list) if aqi_list else 50
+            # Get average values; hours without a reading are skipped
+            pm25 = float(pm25_list.mean()) if pm25_list.size else 0
+            pm10 = float(pm10_list.mean()) if pm10_list.size else 0
+            aqi = float(aqi_list.mean()) if aqi_list.size else 50
             
             # AQI calculation simplified
-            risk_score = 0
-            air_quality_level = "Good"
-            
-            if aqi > 75:
-                risk_score += 25
-                air_quality_level = "Very Unhealthy"
-            elif aqi > 50:
-                risk_score += 20
-                air_quality_level = "Unhealthy for Sensitive Groups"
-            elif aqi > 25:
-                risk_score += 10
-                air_quality_level = "Moderate"
+            risk_score, air_quality_level = AQI_BANDS[np.searchsorted(AQI_THRESHOLDS, aqi)]
             
             return {
                 "status": "success",
@@ -184,62 +251,19 @@ def get_natural_disaster_risk(latitude: float, longitude: float) -> dict:
         dict: Natural disaster risk assessment
     """
     try:
-        # Static seismic zone database based on global earthquake patterns
-        seismic_zones = [
-            {
-                "name": "Pacific Ring of Fire",
-                "latmin": -30, "latmax": 60, "lonmin": 100, "lonmax": 180,
-                "risk": "High", "score": 25, "avg_magnitude": 6.5
-            },
-            {
-                "name": "Mediterranean Belt",
-                "latmin": 30, "latmax": 45, "lonmin": -5, "lonmax": 40,
-                "risk": "Moderate", "score": 15, "avg_magnitude": 5.5
-            },
-            {
-                "name": "Alpine Himalayan Belt",
-                "latmin": 35, "latmax": 50, "lonmin": 0, "lonmax": 90,
-                "risk": "Moderate", "score": 15, "avg_magnitude": 5.0
-            },
-            {
-                "name": "East African Rift",
-                "latmin": -15, "latmax": 15, "lonmin": 20, "lonmax": 40,
-                "risk": "Moderate", "score": 12, "avg_magnitude": 5.0
-            },
-            {
-                "name": "Mid-Ocean Ridges",
-                "latmin": -90, "latmax": 90, "lonmin": -180, "lonmax": 180,
-                "risk": "Low", "score": 5, "avg_magnitude": 4.5
-            }
-        ]
-        
         # Find matching seismic zone
-        matching_zone = None
-        for zone in seismic_zones:
-            if (zone["latmin"] <= latitude <= zone["latmax"] and 
-                zone["lonmin"] <= longitude <= zone["lonmax"]):
-                matching_zone = zone
-                break
+        inside = (
+            (_ZONE_LATMIN <= latitude) & (latitude <= _ZONE_LATMAX) &
+            (_ZONE_LONMIN <= longitude) & (longitude <= _ZONE_LONMAX)
+        )
         
-        if not matching_zone:
-            # Default to low risk for stable areas
-            matching_zone = {
-                "name": "Stable Continental Region",
-                "risk": "Low", "score": 0, "avg_magnitude": 3.5
-            }
+        # argmax gives the first True, i.e. the first zone in table order
+        result = ZONE_RESULTS[int(inside.argmax())] if inside.any() else STABLE_ZONE_RESULT
         
-        logger.info(f"Earthquake zone detection: {matching_zone['name']} for ({latitude}, {longitude})")
+        logger.info(f"Earthquake zone detection: {result['seismic_zone']} for ({latitude}, {longitude})")
         
-        return {
-            "status": "success",
-            "earthquake_risk_level": matching_zone["risk"],
-            "recent_earthquakes_count": 0,
-            "max_magnitude_30days": matching_zone.get("avg_magnitude", 3.5),
-            "risk_score": matching_zone["score"],
-            "recent_activity": [],
-            "seismic_zone": matching_zone.get("name", "Unknown"),
-            "source": "Global Seismic Zone Database"
-        }
+        # Fresh dict and list so callers never share the table's entries
+        return {**result, "recent_activity": []}
         
     except Exception as e:
         logger.error(f"Error in earthquake risk assessment: {e}")
@@ -254,3 +278,32 @@ def get_natural_disaster_risk(latitude: float, longitude: float) -> dict:
             "seismic_zone": "Unknown",
             "source": "Default Assessment"
         }
+
+
+async def gather_destination_data(city: str, country: str, start_date: str, end_date: str):
+    """
+    Geocode the destination, then fetch its forecast and air quality concurrently
+    The seismic lookup is a local table lookup and needs no request
+    
+    Args:
+        city: Destination city
+        country: Destination country
+        start_date: Trip start date (YYYY-MM-DD)
+        end_date: Trip end date (YYYY-MM-DD)
+        
+    Returns:
+        tuple: (weather_data, air_quality, disasters), or None if the destination could not be geocoded
+    """
+    lat, lon = await get_coordinates(city, country)
+    if lat is None or lon is None:
+        return None
+    
+    # Open-Meteo serves forecast and air quality from separate hosts, so the two
+    # can't be merged into one request or one HTTP/2 connection; both are in flight
+    # together on the shared client instead
+    weather_data, air_quality = await asyncio.gather(
+        get_weather_forecast(lat, lon, start_date, end_date),
+        get_air_quality(lat, lon)
+    )
+    
+    return weather_data, air_quality, get_natural_disaster_risk(lat, lon)
@@ -1,5 +1,8 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render,HttpResponse
+from rest_framework import mixins, status
 from rest_framework.viewsets import ModelViewSet
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -7,7 +10,8 @@ from rest_framework.exceptions import PermissionDenied
 from UserApp.permissions import IsAdminOrHR, IsTraveler
 from .models import Traveler, Trip, RiskAnalysisReport
 from .serializers import TravelerSerializer , TripSerializer, RiskAnalysisReportSerializer
-from core.service.agents.orchestrator import orchestrator_agent
+from core.service.analysis import claim_analysis, schedule_analysis
+from core.service.prewarm import schedule_prewarm
 
 
 # Create your views here.
@@ -24,7 +28,16 @@ class TravelerViewSet(ModelViewSet):
         serializer.save()
 
 
-class TripViewSet(ModelViewSet):
+class TripViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    mixins.ListModelMixin,
+    AsyncGenericViewSet,
+):
+    # CRUD actions are the regular sync DRF ones; adrf dispatches them through
+    # sync_to_async so that analyze_risk can run natively on the event loop
     serializer_class = TripSerializer
     permission_classes = [IsAuthenticated]
 
@@ -35,7 +48,7 @@ class TripViewSet(ModelViewSet):
             return Trip.objects.select_related("traveler", "traveler__user")
 
         if user.role == "traveler":
-            return Trip.objects.filter(traveler__user=user)
+            return Trip.objects.select_related("traveler", "traveler__user").filter(traveler__user=user)
 
         return Trip.objects.none()
 
@@ -43,56 +56,75 @@ class TripViewSet(ModelViewSet):
         user = self.request.user
 
         if user.role == "traveler":
-            traveler = Traveler.objects.get(user=user)
+            # Only the foreign key is needed, so fetch just the id (an indexed
+            # lookup on the unique user column) instead of the profile row
+            traveler_id = Traveler.objects.values_list("id", flat=True).get(user=user)
+            traveler = Traveler(pk=traveler_id, user=user)
         else:
             traveler_id = self.request.data.get("traveler")
             if not traveler_id:
                 raise PermissionDenied("Traveler is required")
             traveler = Traveler.objects.get(id=traveler_id)
 
-        serializer.save(traveler=traveler)
+        trip = serializer.save(traveler=traveler)
+        schedule_prewarm(trip)
+
+    def perform_update(self, serializer):
+        trip = serializer.save()
+        schedule_prewarm(trip)
 
     @action(detail=True, methods=["post"], url_path="analyze-risk")
-    def analyze_risk(self, request, pk=None):
+    async def analyze_risk(self, request, pk=None):
         """
         Multi-agent risk analysis endpoint
-        Runs weather, disease, and other agents in parallel
+        Starts the weather, disease, and other agents in the background and answers
+        202 Accepted at once; poll analysis-status for the result
         """
-        trip = self.get_object()
+        trip = await self.aget_object()
+        # Loaded by get_queryset's select_related, so no lazy query on the event loop
         traveler = trip.traveler
 
-        # Run multi-agent orchestrator
-        analysis_result = orchestrator_agent(trip, traveler)
-        
-        if analysis_result.get("status") == "success":
-            # Store the analysis result in database
-            report, created = RiskAnalysisReport.objects.update_or_create(
-                trip=trip,
-                defaults={
-                    "overall_risk_score": analysis_result.get("overall_risk_score", 0),
-                    "weather_risk_score": analysis_result.get("risk_score_breakdown", {}).get("weather_climate", 0),
-                    "disease_risk_score": analysis_result.get("risk_score_breakdown", {}).get("health_disease", 0),
-                    "full_report": analysis_result,
-                    "top_risks": analysis_result.get("top_risks", []),
-                    "recommendations": analysis_result.get("consolidated_recommendations", []),
-                    "executive_summary": analysis_result.get("executive_summary", ""),
-                    "weather_report": analysis_result.get("agent_reports", {}).get("weather_climate", {}),
-                    "disease_report": analysis_result.get("agent_reports", {}).get("health_disease", {}),
-                }
-            )
-            
+        # Only the request that claims the run schedules it; the others report it in progress
+        report_id, claimed = await sync_to_async(claim_analysis)(trip)
+        if claimed:
+            schedule_analysis(trip, traveler)
+
+        return Response({
+            "status": "pending",
+            "message": "Risk analysis started" if claimed else "Risk analysis in progress",
+            "report_id": report_id
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"], url_path="analysis-status")
+    async def analysis_status(self, request, pk=None):
+        """Progress of the trip's risk analysis, with the full analysis once completed"""
+        trip = await self.aget_object()
+        report = await RiskAnalysisReport.objects.filter(trip=trip).afirst()
+
+        if report is None:
+            return Response({
+                "status": "error",
+                "message": "No risk analysis has been requested for this trip"
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # The last completed analysis stays available while a re-run is pending or has failed
+        previous = {"analysis": report.full_report} if report.completed_at else {}
+
+        if report.status == "completed":
             return Response({
                 "status": "success",
-                "message": "Risk analysis completed",
-                "analysis": analysis_result,
-                "report_saved": True
+                "report_id": report.id,
+                "analysis": report.full_report
             })
-        else:
+
+        if report.status == "failed":
             return Response({
                 "status": "error",
-                "message": analysis_result.get("message", "Analysis failed"),
+                "report_id": report.id,
+                "message": report.error_message or "Analysis failed",
                 "overall_risk_score": 50,
-                "risk_level": "Unknown"
-            }, status=400)    
-
+                "risk_level": "Unknown",
+                **previous
+            })
 
+        return Response({"status": "pending", "report_id": report.id, **previous})
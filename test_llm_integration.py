@@ -4,131 +4,199 @@ Quick test to verify LLM recommendation integration
 Tests that the modules are properly integrated
 """
 
+import asyncio
+import contextlib
+import io
 import os
 import sys
-import django
+import types
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TravelRiskAnalyser.settings')
 sys.path.insert(0, os.path.dirname(__file__))
 
-django.setup()
+# Sets up Django
+import conftest  # noqa: F401
 
 from core.models import Traveler, Trip
 from UserApp.models import User
 from core.service.agents.disease_agent import disease_agent, generate_health_recommendations
-from core.service.llm_recommendations import generate_health_recommendations_llm, flatten_recommendations
+from core.service.llm_recommendations import (
+    generate_health_recommendations_llm,
+    generate_health_recommendations_llm_async,
+    flatten_recommendations
+)
 
-print("=" * 60)
-print("LLM Recommendation Integration Test")
-print("=" * 60)
+# Read-only input shared by the tests; callers that need a dict take a copy
+SAMPLE_HEALTH_DATA = types.MappingProxyType({
+    "destination": "Egypt",
+    "health_conditions": "No pre-existing conditions",
+    "frequent_traveler": True,
+    "covid_data": {
+        "status": "success",
+        "risk_level": "Medium",
+        "cases_per_million": 45
+    },
+    "disease_outbreaks": ["Yellow Fever", "Hepatitis A"],
+    "required_vaccines": ["Yellow Fever"],
+    "recommended_vaccines": ["Hepatitis A", "Typhoid"],
+    "healthcare_quality": "Good"
+})
+
+
+def _params(func):
+    """Positional parameter names, read off the code object"""
+    code = func.__code__
+    return code.co_varnames[:code.co_argcount]
+
+
+_EXPECTED_PARAMS = (
+    (disease_agent, ("trip", "traveler")),
+    (generate_health_recommendations, (
+        "trip", "traveler", "covid_data", "outbreaks", "vaccines", "healthcare", "risk_score"
+    )),
+    (generate_health_recommendations_llm, ("health_risk_data", "bypass_cache")),
+)
+
+
+@contextlib.contextmanager
+def _section():
+    """
+    Collect one test's prints and write them in one call when it ends,
+    also when the test stops the script with sys.exit
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            yield
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+with _section():
+    print("=" * 60)
+    print("LLM Recommendation Integration Test")
+    print("=" * 60)
 
 # Test 1: Module imports
-print("\n[Test 1] Verifying module imports...")
-try:
-    from core.service.agents.disease_agent import disease_agent
-    print("  ✓ disease_agent module imported")
-    from core.service.llm_recommendations import generate_health_recommendations_llm
-    print("  ✓ llm_recommendations module imported")
-except Exception as e:
-    print(f"  ✗ Import failed: {e}")
-    sys.exit(1)
+with _section():
+    print("\n[Test 1] Verifying module imports...")
+    try:
+        from core.service.agents.disease_agent import disease_agent
+        print("  ✓ disease_agent module imported")
+        from core.service.llm_recommendations import generate_health_recommendations_llm
+        print("  ✓ llm_recommendations module imported")
+    except Exception as e:
+        print(f"  ✗ Import failed: {e}")
+        sys.exit(1)
 
 # Test 2: Function signatures
-print("\n[Test 2] Verifying function signatures...")
-try:
-    import inspect
-    
-    sig = inspect.signature(disease_agent)
-    print(f"  ✓ disease_agent signature: {sig}")
-    
-    sig = inspect.signature(generate_health_recommendations)
-    print(f"  ✓ generate_health_recommendations signature: {sig}")
-    
-    sig = inspect.signature(generate_health_recommendations_llm)
-    print(f"  ✓ generate_health_recommendations_llm signature: {sig}")
-except Exception as e:
-    print(f"  ✗ Signature check failed: {e}")
-    sys.exit(1)
+with _section():
+    print("\n[Test 2] Verifying function signatures...")
+    try:
+        for func, expected in _EXPECTED_PARAMS:
+            params = _params(func)
+            assert params == expected, f"{func.__name__} takes {params}, expected {expected}"
+            print(f"  ✓ {func.__name__} parameters: {params}")
+    except Exception as e:
+        print(f"  ✗ Signature check failed: {e}")
+        sys.exit(1)
 
 # Test 3: Test data structure
-print("\n[Test 3] Testing with sample health data...")
-try:
-    sample_health_data = {
-        "destination": "Egypt",
-        "health_conditions": "No pre-existing conditions",
-        "frequent_traveler": True,
-        "covid_data": {
-            "status": "success",
-            "risk_level": "Medium",
-            "cases_per_million": 45
-        },
-        "disease_outbreaks": ["Yellow Fever", "Hepatitis A"],
-        "required_vaccines": ["Yellow Fever"],
-        "recommended_vaccines": ["Hepatitis A", "Typhoid"],
-        "healthcare_quality": "Good"
-    }
-    
-    print(f"  ✓ Sample health data structure created")
-    print(f"    - Destination: {sample_health_data['destination']}")
-    print(f"    - Vaccines required: {sample_health_data['required_vaccines']}")
-except Exception as e:
-    print(f"  ✗ Data structure test failed: {e}")
-    sys.exit(1)
+with _section():
+    print("\n[Test 3] Testing with sample health data...")
+    try:
+        print(f"  ✓ Sample health data structure created")
+        print(f"    - Destination: {SAMPLE_HEALTH_DATA['destination']}")
+        print(f"    - Vaccines required: {SAMPLE_HEALTH_DATA['required_vaccines']}")
+    except Exception as e:
+        print(f"  ✗ Data structure test failed: {e}")
+        sys.exit(1)
 
 # Test 4: LLM function behavior
-print("\n[Test 4] Testing LLM function behavior...")
-try:
-    # Test with real LLM call (will need Azure credentials)
-    result = generate_health_recommendations_llm(sample_health_data)
-    
-    if result:
-        print(f"  ✓ LLM returned recommendations")
-        print(f"    - Type: {type(result)}")
-        if isinstance(result, dict):
-            for key in result.keys():
-                count = len(result[key]) if isinstance(result[key], list) else 1
-                print(f"    - {key}: {count} items")
-    else:
-        print(f"  ⚠ LLM returned None (may need Azure credentials)")
-except Exception as e:
-    print(f"  ⚠ LLM call encountered error (expected if Azure not configured)")
-    print(f"    Error: {type(e).__name__}: {str(e)[:100]}")
+with _section():
+    print("\n[Test 4] Testing LLM function behavior...")
+    try:
+        # Test with real LLM call (will need Azure credentials)
+        result = asyncio.run(generate_health_recommendations_llm_async(dict(SAMPLE_HEALTH_DATA)))
+        
+        if result:
+            print(f"  ✓ LLM returned recommendations")
+            print(f"    - Type: {type(result)}")
+            if isinstance(result, dict):
+                for key in result.keys():
+                    count = len(result[key]) if isinstance(result[key], list) else 1
+                    print(f"    - {key}: {count} items")
+        else:
+            print(f"  ⚠ LLM returned None (may need Azure credentials)")
+    except Exception as e:
+        print(f"  ⚠ LLM call encountered error (expected if Azure not configured)")
+        print(f"    Error: {type(e).__name__}: {str(e)[:100]}")
 
 # Test 5: Fallback mechanism
-print("\n[Test 5] Testing fallback recommendation generation...")
-try:
-    # This should work even without Azure credentials
-    from core.service.agents.disease_agent import _generate_fallback_health_recommendations
-    
-    test_covid = {"status": "success", "risk_level": "High"}
-    test_outbreaks = {"status": "success", "endemic_diseases": ["malaria"]}
-    test_vaccines = {"status": "success", "required_vaccines": ["Yellow Fever"]}
-    test_healthcare = {"status": "success", "healthcare_quality": "Fair", "estimated_cost_level": "High"}
-    
-    class MockTraveler:
-        health_conditions = None
-        frequent_traveler = True
-    
-    recommendations = _generate_fallback_health_recommendations(
-        test_covid, test_outbreaks, test_vaccines, test_healthcare,
-        MockTraveler(), 60
-    )
-    
-    print(f"  ✓ Fallback generation works")
-    print(f"    - Generated {len(recommendations)} recommendations")
-    for i, rec in enumerate(recommendations[:3], 1):
-        print(f"    - {i}. {rec[:60]}...")
-except Exception as e:
-    print(f"  ✗ Fallback test failed: {e}")
-    sys.exit(1)
-
-print("\n" + "=" * 60)
-print("All integration tests passed!")
-print("=" * 60)
-print("\nSummary:")
-print("  ✓ LLM module properly integrated into disease_agent")
-print("  ✓ Function signatures updated correctly")
-print("  ✓ Fallback mechanism is in place")
-print("  ✓ System ready for Azure LLM integration")
-print("\nNote: LLM calls require Azure OpenAI credentials in settings.py")
+with _section():
+    print("\n[Test 5] Testing fallback recommendation generation...")
+    try:
+        # This should work even without Azure credentials
+        from core.service.agents.disease_agent import _generate_fallback_health_recommendations
+        
+        test_covid = {"status": "success", "risk_level": "High"}
+        test_outbreaks = {"status": "success", "endemic_diseases": ["malaria"]}
+        test_vaccines = {"status": "success", "required_vaccines": ["Yellow Fever"]}
+        test_healthcare = {"status": "success", "healthcare_quality": "Fair", "estimated_cost_level": "High"}
+        
+        class MockTraveler:
+            health_conditions = None
+            frequent_traveler = True
+        
+        recommendations = _generate_fallback_health_recommendations(
+            test_covid, test_outbreaks, test_vaccines, test_healthcare,
+            MockTraveler(), 60
+        )
+        
+        print(f"  ✓ Fallback generation works")
+        print(f"    - Generated {len(recommendations)} recommendations")
+        for i, rec in enumerate(recommendations[:3], 1):
+            print(f"    - {i}. {rec[:60]}...")
+    except Exception as e:
+        print(f"  ✗ Fallback test failed: {e}")
+        sys.exit(1)
+
+# Test 6: Batch submission
+with _section():
+    print("\n[Test 6] Testing batch recommendation submission...")
+    if os.environ.get("RUN_BATCH_TEST") != "1":
+        # Every submission is a billed Batch API job
+        print("  ⚠ Skipped: set RUN_BATCH_TEST=1 to submit a real batch job")
+    else:
+        try:
+            # Submits a real batch job (will need Azure credentials and a Global Batch deployment)
+            from core.service.llm_recommendations_batch import cancel_batch, submit_batch
+            
+            batch_payloads = [
+                {**SAMPLE_HEALTH_DATA, "destination": destination}
+                for destination in ("Egypt", "Kenya", "Brazil")
+            ]
+            batch_id = submit_batch(batch_payloads)
+            
+            try:
+                assert isinstance(batch_id, str) and batch_id.startswith("batch_"), f"Unexpected batch id: {batch_id!r}"
+                print(f"  ✓ Batch submitted")
+                print(f"    - Batch id: {batch_id}")
+                print(f"    - Requests: {len(batch_payloads)}")
+            finally:
+                # Only the submission is under test; don't leave the job running
+                print(f"    - Cancelled: {cancel_batch(batch_id)}")
+        except Exception as e:
+            print(f"  ⚠ Batch submission encountered error (expected if Azure not configured)")
+            print(f"    Error: {type(e).__name__}: {str(e)[:100]}")
+
+with _section():
+    print("\n" + "=" * 60)
+    print("All integration tests passed!")
+    print("=" * 60)
+    print("\nSummary:")
+    print("  ✓ LLM module properly integrated into disease_agent")
+    print("  ✓ Function signatures updated correctly")
+    print("  ✓ Fallback mechanism is in place")
+    print("  ✓ System ready for Azure LLM integration")
+    print("\nNote: LLM calls require Azure OpenAI credentials in settings.py")
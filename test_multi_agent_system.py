@@ -3,15 +3,47 @@ Test suite for multi-agent travel risk analysis system
 Tests all agents and tools independently and as integrated system
 """
 
-import os
-import django
+import asyncio
+import contextlib
+import io
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TravelRiskAnalyser.settings')
-django.setup()
+# Sets up Django and provides the shared traveler
+from conftest import shared_traveler
 
-from core.models import Traveler, Trip
+# External API hosts the tests reach
+API_HOSTS = (
+    "geocoding-api.open-meteo.com",
+    "api.open-meteo.com",
+    "air-quality-api.open-meteo.com",
+    "disease.sh",
+    "restcountries.com",
+)
+
+
+def _resolve(host):
+    """Look up a host ahead of its first request, warming the system resolver's cache (nscd, systemd-resolved)"""
+    try:
+        socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except OSError:
+        # The test's own request reports the failure
+        pass
+
+
+# Started before the remaining imports, so the lookups overlap them
+for host in API_HOSTS:
+    threading.Thread(target=_resolve, args=(host,), name=f"resolve-{host}", daemon=True).start()
+
+from django.db import connections
+
+from core.models import Trip
+from core.service.background import submit
 from core.service.tools.geo_tools import get_coordinates, get_country_code
 from core.service.tools.weather_tools import (
     get_weather_forecast,
@@ -29,19 +61,110 @@ from core.service.agents.disease_agent import disease_agent
 from core.service.agents.orchestrator import orchestrator_agent
 
 
+# Suite banners; boxed on a terminal, a plain line in piped output such as CI logs
+_BANNER_EDGE = "█"*60
+_BANNER_EMPTY = "█" + " "*58 + "█"
+_QUIET = not sys.stdout.isatty()
+
+
+def _banner(message):
+    if _QUIET:
+        print(message.strip())
+        return
+    print(_BANNER_EDGE)
+    print(_BANNER_EMPTY)
+    print("█" + message.center(58) + "█")
+    print(_BANNER_EMPTY)
+    print(_BANNER_EDGE)
+
+
+def _run(coro):
+    """
+    Run a coroutine to completion on the shared background loop
+    Unlike a fresh asyncio.run loop per call, every test reuses that loop's pooled
+    HTTP client, so connections to each API host stay open across tests
+    """
+    return submit(coro).result()
+
+
+@contextlib.contextmanager
+def _test_block(name):
+    """
+    Time an agent test's body; a failure is reported with its traceback instead of raised
+    The agents return error reports rather than raising, so there is nothing to retry here
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        print(f"✗ {name} test failed: {e}")
+        traceback.print_exc()
+    else:
+        print(f"  - Took {time.perf_counter() - started:.2f}s")
+
+
+async def _gather(*aws):
+    """Await independent tool calls concurrently from the sync test functions"""
+    return await asyncio.gather(*aws)
+
+
+class _PerThreadStdout(io.TextIOBase):
+    """sys.stdout stand-in that routes a thread's prints to its buffer while it has one"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+    
+    def write(self, text):
+        return getattr(self.local, "buffer", self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    @contextlib.contextmanager
+    def captured(self):
+        """Hold back the current thread's prints, then write them in one call"""
+        self.local.buffer = buffer = io.StringIO()
+        try:
+            yield
+        finally:
+            del self.local.buffer
+            with self.lock:
+                self.stream.write(buffer.getvalue())
+                self.stream.flush()
+
+
+def _run_captured(test, *args):
+    """
+    Run one test on a pool thread with its output held back until it finishes,
+    then written as one block so concurrent tests don't interleave
+    """
+    with sys.stdout.captured():
+        try:
+            return test(*args)
+        finally:
+            # Django opens a database connection per thread; close this one's
+            connections.close_all()
+
+
 def test_geo_tools():
     """Test geocoding and country code tools"""
     print("\n" + "="*60)
     print("TESTING GEO TOOLS")
     print("="*60)
     
+    # Both lookups are independent, so they run together
+    (lat, lon), code = _run(_gather(
+        get_coordinates("Cairo", "Egypt"),
+        get_country_code("Egypt")
+    ))
+    
     # Test coordinate retrieval
-    lat, lon = get_coordinates("Cairo", "Egypt")
     print(f"✓ Cairo, Egypt coordinates: ({lat}, {lon})")
     assert lat is not None and lon is not None, "Failed to get coordinates"
     
     # Test country code
-    code = get_country_code("Egypt")
     print(f"✓ Egypt country code: {code}")
     
     return lat, lon
@@ -56,8 +179,13 @@ def test_weather_tools(lat, lon):
     start_date = date.today()
     end_date = start_date + timedelta(days=7)
     
+    # Forecast and air quality are separate requests; fetch them concurrently
+    weather, air_quality = _run(_gather(
+        get_weather_forecast(lat, lon, str(start_date), str(end_date)),
+        get_air_quality(lat, lon)
+    ))
+    
     # Test weather forecast
-    weather = get_weather_forecast(lat, lon, str(start_date), str(end_date))
     print(f"✓ Weather forecast retrieved")
     print(f"  - Status: {weather.get('status')}")
     if weather.get('status') == 'success':
@@ -66,7 +194,6 @@ def test_weather_tools(lat, lon):
         print(f"  - Risk Score: {weather.get('risk_score')}/100")
     
     # Test air quality
-    air_quality = get_air_quality(lat, lon)
     print(f"✓ Air quality retrieved")
     print(f"  - Status: {air_quality.get('status')}")
     if air_quality.get('status') == 'success':
@@ -92,8 +219,13 @@ def test_disease_tools():
     
     country = "Egypt"
     
+    # The two networked tools run concurrently; the others are local table lookups
+    covid, vaccines = _run(_gather(
+        get_covid_status(country),
+        get_vaccination_requirements(country)
+    ))
+    
     # Test COVID status
-    covid = get_covid_status(country)
     print(f"✓ COVID-19 data retrieved for {country}")
     print(f"  - Status: {covid.get('status')}")
     if covid.get('status') == 'success':
@@ -110,7 +242,6 @@ def test_disease_tools():
         print(f"  - Risk Score: {outbreaks.get('risk_score')}/100")
     
     # Test vaccination requirements
-    vaccines = get_vaccination_requirements(country)
     print(f"✓ Vaccination requirements retrieved")
     print(f"  - Status: {vaccines.get('status')}")
     if vaccines.get('status') == 'success':
@@ -126,35 +257,15 @@ def test_disease_tools():
         print(f"  - Risk Score: {healthcare.get('risk_score')}/100")
 
 
-def test_weather_agent():
+def test_weather_agent(traveler):
     """Test weather agent with sample data"""
     print("\n" + "="*60)
     print("TESTING WEATHER AGENT")
     print("="*60)
     
-    # Create test trip and traveler
-    from UserApp.models import User
-    
-    try:
-        user = User.objects.first()
-        if not user:
-            # Create test user if none exists
-            user = User.objects.create_user(
-                username='test_traveler',
-                email='test@example.com',
-                password='testpass123',
-                role='traveler'
-            )
-        
-        traveler, _ = Traveler.objects.get_or_create(
-            user=user,
-            defaults={
-                'health_conditions': 'Asthma',
-                'frequent_traveler': False
-            }
-        )
-        
-        trip = Trip.objects.create(
+    with _test_block("Weather agent"):
+        # Built in memory only: the agents just read its fields, so nothing is written
+        trip = Trip(
             traveler=traveler,
             destination_country='Egypt',
             destination_city='Cairo',
@@ -165,7 +276,9 @@ def test_weather_agent():
             transport_mode='Flight'
         )
         
-        result = weather_agent(trip, traveler)
+        result = _run(weather_agent(trip, traveler))
+        if not isinstance(result, dict):
+            result = result.to_dict()
         print(f"✓ Weather agent completed")
         print(f"  - Status: {result.get('status')}")
         if result.get('status') == 'success':
@@ -173,40 +286,17 @@ def test_weather_agent():
             print(f"  - Risk Level: {result.get('risk_level')}")
             print(f"  - Temperature: {result.get('weather', {}).get('avg_temperature')}°C")
             print(f"  - Recommendations: {len(result.get('recommendations', []))} provided")
-        
-        trip.delete()
-        
-    except Exception as e:
-        print(f"✗ Weather agent test failed: {e}")
 
 
-def test_disease_agent():
+def test_disease_agent(traveler):
     """Test disease agent with sample data"""
     print("\n" + "="*60)
     print("TESTING DISEASE AGENT")
     print("="*60)
     
-    from UserApp.models import User
-    
-    try:
-        user = User.objects.first()
-        if not user:
-            user = User.objects.create_user(
-                username='test_traveler2',
-                email='test2@example.com',
-                password='testpass123',
-                role='traveler'
-            )
-        
-        traveler, _ = Traveler.objects.get_or_create(
-            user=user,
-            defaults={
-                'health_conditions': 'Diabetes',
-                'frequent_traveler': True
-            }
-        )
-        
-        trip = Trip.objects.create(
+    with _test_block("Disease agent"):
+        # Built in memory only: the agents just read its fields, so nothing is written
+        trip = Trip(
             traveler=traveler,
             destination_country='Egypt',
             destination_city='Cairo',
@@ -217,7 +307,7 @@ def test_disease_agent():
             transport_mode='Flight'
         )
         
-        result = disease_agent(trip, traveler)
+        result = _run(disease_agent(trip, traveler))
         print(f"✓ Disease agent completed")
         print(f"  - Status: {result.get('status')}")
         if result.get('status') == 'success':
@@ -226,40 +316,17 @@ def test_disease_agent():
             print(f"  - COVID Level: {result.get('covid_19', {}).get('risk_level')}")
             print(f"  - Required Vaccines: {', '.join(result.get('vaccination_requirements', {}).get('required', [])[:1])}")
             print(f"  - Recommendations: {len(result.get('recommendations', []))} provided")
-        
-        trip.delete()
-        
-    except Exception as e:
-        print(f"✗ Disease agent test failed: {e}")
 
 
-def test_orchestrator():
+def test_orchestrator(traveler):
     """Test full orchestrator with multiple agents"""
     print("\n" + "="*60)
     print("TESTING ORCHESTRATOR (FULL SYSTEM)")
     print("="*60)
     
-    from UserApp.models import User
-    
-    try:
-        user = User.objects.first()
-        if not user:
-            user = User.objects.create_user(
-                username='test_orchestrator',
-                email='test_orch@example.com',
-                password='testpass123',
-                role='traveler'
-            )
-        
-        traveler, _ = Traveler.objects.get_or_create(
-            user=user,
-            defaults={
-                'health_conditions': 'None',
-                'frequent_traveler': True
-            }
-        )
-        
-        trip = Trip.objects.create(
+    with _test_block("Orchestrator"):
+        # Built in memory only: the agents just read its fields, so nothing is written
+        trip = Trip(
             traveler=traveler,
             destination_country='Egypt',
             destination_city='Cairo',
@@ -271,7 +338,7 @@ def test_orchestrator():
         )
         
         print("Running orchestrator with all agents in parallel...")
-        result = orchestrator_agent(trip, traveler)
+        result = _run(orchestrator_agent(trip, traveler))
         
         print(f"✓ Orchestrator completed")
         print(f"  - Status: {result.get('status')}")
@@ -289,44 +356,60 @@ def test_orchestrator():
                 print(f"    - {rec}")
             print(f"\n  EXECUTIVE SUMMARY:")
             print(f"    {result.get('executive_summary', 'N/A')}")
-        
-        trip.delete()
-        
-    except Exception as e:
-        print(f"✗ Orchestrator test failed: {e}")
-        import traceback
-        traceback.print_exc()
 
 
 def run_all_tests():
     """Run complete test suite"""
-    print("\n" + "█"*60)
-    print("█" + " "*58 + "█")
-    print("█" + "  TRAVEL RISK ANALYSIS MULTI-AGENT SYSTEM TEST SUITE".center(58) + "█")
-    print("█" + " "*58 + "█")
-    print("█"*60)
-    
+    # Output is written once per test block instead of once per print
+    stdout = sys.stdout = _PerThreadStdout(sys.stdout)
     try:
-        # Test tools
-        lat, lon = test_geo_tools()
-        test_weather_tools(lat, lon)
-        test_disease_tools()
+        with stdout.captured():
+            print()
+            _banner("  TRAVEL RISK ANALYSIS MULTI-AGENT SYSTEM TEST SUITE")
+            
+            # Only the weather tools need coordinates; fetched up front (and cached for
+            # test_geo_tools) so all tests can start at once
+            lat, lon = _run(get_coordinates("Cairo", "Egypt"))
+            # Set up here so the concurrent agent tests don't race to create it
+            traveler = shared_traveler()
         
-        # Test agents
-        test_weather_agent()
-        test_disease_agent()
-        test_orchestrator()
+        # Every test waits on external APIs, so they run concurrently
+        tests = (
+            (test_geo_tools,),
+            (test_weather_tools, lat, lon),
+            (test_disease_tools,),
+            (test_weather_agent, traveler),
+            (test_disease_agent, traveler),
+            (test_orchestrator, traveler),
+        )
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {executor.submit(_run_captured, *test): test[0].__name__ for test in tests}
+            
+            # A failing test is reported without stopping the others
+            failures = [
+                (futures[future], future.exception())
+                for future in as_completed(futures)
+                if future.exception() is not None
+            ]
         
-        print("\n" + "█"*60)
-        print("█" + " "*58 + "█")
-        print("█" + "  ALL TESTS COMPLETED SUCCESSFULLY ✓".center(58) + "█")
-        print("█" + " "*58 + "█")
-        print("█"*60 + "\n")
+        with stdout.captured():
+            if failures:
+                for name, e in failures:
+                    print(f"\n✗ {name} failed: {e}")
+                    traceback.print_exception(e)
+                print(f"\n✗ Test suite failed: {len(failures)} of {len(tests)} tests failed")
+                return
+            
+            print()
+            _banner("  ALL TESTS COMPLETED SUCCESSFULLY ✓")
+            print()
         
     except Exception as e:
         print(f"\n✗ Test suite failed: {e}")
-        import traceback
         traceback.print_exc()
+    
+    finally:
+        sys.stdout = stdout.stream
 
 
 if __name__ == "__main__":